@@ -6,6 +6,7 @@
     - GET /tasks/{task_id}/status: 轮询任务处理进度
     - 后台任务编排 PPT 提取与音频转录两个独立模块
 """
+import asyncio
 import uuid
 import shutil
 from pathlib import Path
@@ -16,7 +17,7 @@ from loguru import logger
 
 from app.services.video_service import VideoService
 from app.services.files_service import secure_delete
-from app.core.config import TEMP_DIR
+from app.core.config import MAX_CONCURRENT_TASKS, TEMP_DIR
 from app.core.task_manager import (
     init_task, 
     update_task_progress, 
@@ -27,6 +28,27 @@ from app.core.task_manager import (
 
 router = APIRouter()
 
+# 处理任务并发槽位
+# Why 信号量而非直接交给 BackgroundTasks 并发执行?
+#   每个后台任务都会在线程池中独占 GPU 解码/推理，
+#   无上限并发会在单卡上相互拖慢，排队串行反而总吞吐更高
+_task_slots = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
+
+# 上传落盘的拷贝缓冲区大小 (16 MB，大块顺序写吞吐更高)
+UPLOAD_COPY_BUFFER_SIZE = 16 * 1024 * 1024
+
+
+def _save_upload(file: UploadFile, dst_path: Path) -> None:
+    """
+    将上传文件流拷贝到本地路径 (同步，应在线程池中调用)
+    
+    Args:
+        file: FastAPI 上传文件对象
+        dst_path: 目标保存路径
+    """
+    with dst_path.open("wb") as buffer:
+        shutil.copyfileobj(file.file, buffer, UPLOAD_COPY_BUFFER_SIZE)
+
 
 # ============================================================
 #                   后台任务处理函数
@@ -74,12 +96,14 @@ async def run_video_task(
         # Why run_in_threadpool?
         #   - FastAPI 的事件循环不应被阻塞
         #   - 视频处理包含大量同步 I/O 和计算
-        result = await run_in_threadpool(
-            service.process, 
-            temp_file_path, 
-            enable_ppt_extraction=enable_ppt_extraction,
-            enable_audio_transcription=enable_audio_transcription
-        )
+        # 先获取并发槽位，排队期间进度停留在 "等待处理资源..."
+        async with _task_slots:
+            result = await run_in_threadpool(
+                service.process, 
+                temp_file_path, 
+                enable_ppt_extraction=enable_ppt_extraction,
+                enable_audio_transcription=enable_audio_transcription
+            )
         
         # ========== 结果处理 ==========
         ppt_url = None
@@ -172,8 +196,9 @@ async def upload_video(
     # ========== 保存临时文件 ==========
     temp_file_path = TEMP_DIR / f"{task_id}_{file.filename}"
     try:
-        with temp_file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Why run_in_threadpool?
+        #   copyfileobj 是同步 I/O，大文件落盘期间不应阻塞事件循环 (状态轮询等请求)
+        await run_in_threadpool(_save_upload, file, temp_file_path)
         logger.debug(f"   💾 临时文件已保存: {temp_file_path}")
     except Exception as e:
         logger.error(f"❌ 文件保存失败: {e}")
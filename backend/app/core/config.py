@@ -5,7 +5,10 @@
     - 使用 pathlib 处理路径，确保 Windows/Linux 兼容性
     - 自动创建必要的目录结构
     - 定义允许上传的文件格式白名单
+    - 调试开关 (环境变量控制)
+    - 任务并发上限 (环境变量控制)
 """
+import os
 from pathlib import Path
 
 
@@ -25,13 +28,18 @@ TEMP_DIR.mkdir(parents=True, exist_ok=True)
 # 目录结构:
 #   output/{task_id}/
 #       ├── cropped_video/   # 裁剪后的视频
-#       ├── debug_images/    # 边缘检测调试图
+#       ├── debug_images/    # 边缘检测调试图 (需开启 DEBUG_IMAGES_ENABLED)
 #       ├── ppt_images/      # PPT 页面截图
 #       ├── ppt_output/      # 最终 PPTX 文件
 #       └── transcripts/     # 转录文本文件
 OUTPUT_DIR = BASE_DIR / "output"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# 缓存文件夹: 跨任务复用的分析结果 (如 PPT 区域定位)
+# 可随时删除，删除后仅影响首次处理速度
+CACHE_DIR = BASE_DIR / "cache"
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
 
 # ============================================================
 #              上传配置
@@ -45,3 +53,21 @@ ALLOWED_EXTENSIONS = {
     ".mkv",   # Matroska (支持多音轨/字幕)
     ".m4s",   # MPEG-DASH 分片
 }
+
+
+# ============================================================
+#              调试配置
+# ============================================================
+# 是否输出 ROI 定位调试图 (debug_images/)
+# 默认关闭: 每个采样点的中间结果 + 最终区域图会在热路径上产生额外编码与写盘
+# 启用方式: 设置环境变量 AUDIO2NOTE_DEBUG_IMAGES=1
+DEBUG_IMAGES_ENABLED = os.environ.get("AUDIO2NOTE_DEBUG_IMAGES", "0") == "1"
+
+
+# ============================================================
+#              任务调度配置
+# ============================================================
+# 同时执行的视频处理任务上限，超出的任务排队等待
+# 默认 1: 单 GPU 上并发任务会争用 NVDEC/显存，整体反而更慢甚至 OOM
+# 多 GPU 或大显存机器可通过环境变量 AUDIO2NOTE_MAX_CONCURRENT_TASKS 调高
+MAX_CONCURRENT_TASKS = max(1, int(os.environ.get("AUDIO2NOTE_MAX_CONCURRENT_TASKS", "1")))
@@ -18,6 +18,7 @@ from starlette.responses import FileResponse # Moved import to top
 from app.api.v1.endpoints import router as api_router
 from app.core.config import OUTPUT_DIR, BASE_DIR
 from app.services.audio_service import init_audio_service
+from app.services.video_service import VideoService
 
 
 # ============================================================
@@ -110,6 +111,9 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 60)
     logger.info("👋 Video2Note 后端服务关闭中...")
     
+    # 释放跨任务共享的帧处理器 (需在清空显存缓存之前)
+    VideoService.shutdown()
+    
     # ========== GPU 显存释放 ==========
     # Why 在 shutdown 阶段清理?
     #   - 确保服务优雅关闭时释放所有 GPU 资源
@@ -10,14 +10,19 @@
     - 全程使用 torch.Tensor 在 GPU 上运算，避免 CPU-GPU 数据传输开销
     - 支持 min_scene_duration 过滤动态画面片段
     - Generator 模式流式输出，避免内存占用过高
+    - get_frame_processor() 按参数缓存实例，多个任务共享同一 CUDA 上下文
 
 依赖: torch (CUDA), opencv-python
 """
+import functools
+import threading
+
 import cv2
+import numpy as np
 import torch
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Generator, Callable, Optional
+from dataclasses import dataclass, field
+from typing import Generator, Callable, Iterable, Optional, Tuple
 
 from loguru import logger
 
@@ -40,12 +45,14 @@ class BestShot:
         sharpness_score: 拉普拉斯清晰度得分 (越高越清晰)
         scene_start_ts: 所属场景的起始时间戳 (秒)
         scene_end_ts: 所属场景的结束时间戳 (秒)
+        frame: 冠军帧画面 (BGR)，L3 直接使用，无需重新解码视频
     """
     timestamp: float          # 核心锚点 (秒)
     frame_index: int          # 仅供调试参考
     sharpness_score: float
     scene_start_ts: float     # 场景起始时间 (秒)
     scene_end_ts: float       # 场景结束时间 (秒)
+    frame: Optional[np.ndarray] = field(default=None, repr=False)
 
 
 class GPUFrameProcessor:
@@ -128,6 +135,10 @@ class GPUFrameProcessor:
             device=self.device
         ).view(1, 1, 3, 3)
         
+        # ========== 线程级灰度缓冲区 ==========
+        # 流式帧尺寸固定，cvtColor 直接写入复用的缓冲区，避免每帧分配
+        self._gray_buf = threading.local()
+        
         logger.debug(f"⚙️ 参数配置: diff_threshold={diff_threshold}, "
                     f"min_scene_duration={min_scene_duration}s, sample_interval={sample_interval}s")
     
@@ -145,10 +156,16 @@ class GPUFrameProcessor:
         Returns:
             torch.Tensor: 归一化到 [0, 1] 的灰度张量
         """
-        # BGR -> Gray (使用 OpenCV，比 torch 更快)
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        # numpy -> torch，并归一化到 0-1
-        tensor = torch.from_numpy(gray).float().to(self.device) / 255.0
+        # BGR -> Gray (使用 OpenCV，比 torch 更快)，写入线程内复用的缓冲区
+        gray = getattr(self._gray_buf, "buf", None)
+        if gray is None or gray.shape != frame.shape[:2]:
+            gray = np.empty(frame.shape[:2], dtype=np.uint8)
+            self._gray_buf.buf = gray
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+        
+        # numpy -> torch: 以 uint8 上传 (传输量为 float32 的 1/4)，在设备端转换并归一化到 0-1
+        # .to() / .float() 均产生新张量，缓冲区可安全地被下一帧覆盖
+        tensor = torch.from_numpy(gray).to(self.device).float() / 255.0
         return tensor
     
     def compute_frame_difference(
@@ -176,9 +193,13 @@ class GPUFrameProcessor:
         Returns:
             float: 差异分数 (0-1)，越大差异越大
         """
-        diff = torch.abs(frame1 - frame2).mean().item()
+        diff = self._mad_tensor(frame1, frame2).item()
         return diff
     
+    def _mad_tensor(self, frame1: torch.Tensor, frame2: torch.Tensor) -> torch.Tensor:
+        """MAD 差异度 (0 维张量，不触发设备同步)"""
+        return torch.abs(frame1 - frame2).mean()
+    
     def compute_laplacian_sharpness(self, frame: torch.Tensor) -> float:
         """
         L2 质量层核心: 计算帧的清晰度得分 (Laplacian Variance)
@@ -199,6 +220,11 @@ class GPUFrameProcessor:
         Returns:
             float: 清晰度得分 (越高越清晰)
         """
+        variance = self._laplacian_variance_tensor(frame).item()
+        return variance
+    
+    def _laplacian_variance_tensor(self, frame: torch.Tensor) -> torch.Tensor:
+        """拉普拉斯方差清晰度 (0 维张量，不触发设备同步)"""
         # 添加 batch 和 channel 维度: (H, W) -> (1, 1, H, W)
         frame_4d = frame.unsqueeze(0).unsqueeze(0)
         
@@ -210,8 +236,7 @@ class GPUFrameProcessor:
         )
         
         # 返回方差作为清晰度得分
-        variance = laplacian.var().item()
-        return variance
+        return laplacian.var()
     
     def extract_best_shots(
         self,
@@ -219,22 +244,21 @@ class GPUFrameProcessor:
         progress_callback: Optional[Callable[[int, str], None]] = None
     ) -> Generator[BestShot, None, None]:
         """
-        主入口: 从视频中提取每个场景的"冠军帧" (Timestamp-First)
+        独立入口: 用 OpenCV 直接读取视频文件，提取每个场景的"冠军帧" (Timestamp-First)
         
-        算法流程:
-            1. 按 sample_interval 秒采样视频帧
-            2. 实时计算帧间差异 (L1)
-            3. 当差异超过阈值，标记为新场景
-            4. 对上一个场景，选出清晰度最高的帧 (L2)
-            5. 场景持续时间不足 min_scene_duration 的，视为"动态片段"丢弃
+        使用 OpenCV 按 sample_interval 秒采样视频帧，
+        交给 extract_best_shots_from_frames() 执行 L1+L2 分析。
+        
+        VideoService 的 PPT 流水线不经过此方法，而是由 ffmpeg 帧流
+        (stream_lightweight_frames) 直接喂给 extract_best_shots_from_frames()；
+        此方法保留给单独调用 / 旧调用方使用。
         
         关键设计:
             - 所有输出基于时间戳 (秒)，而非帧号
             - 使用 CAP_PROP_POS_MSEC 获取精确时间戳
         
         Args:
-            video_path: 输入视频路径
-                - 建议传入轻量视频以加速处理
+            video_path: 输入视频路径 (原始视频即可，无需预先转码)
             progress_callback: 进度回调函数
                 - 签名: callback(percent: int, message: str)
                 - 用于更新任务进度条
@@ -265,98 +289,166 @@ class GPUFrameProcessor:
             logger.info(f"   📊 总时长: {duration:.1f}s, FPS: {fps:.1f}")
             logger.info(f"   ⚙️ 采样间隔: {self.sample_interval}s ({frame_sample_interval} 帧)")
             
-            # ========== 场景状态机 ==========
-            prev_tensor: Optional[torch.Tensor] = None
-            scene_start_ts: float = 0.0            # 当前场景起始时间戳
-            scene_best_ts: float = 0.0             # 当前场景最清晰帧时间戳
-            scene_best_frame_idx: int = 0          # 当前场景最清晰帧索引 (调试用)
-            scene_best_sharpness: float = -1.0     # 当前场景最高清晰度
+            yield from self.extract_best_shots_from_frames(
+                self._iter_sampled_frames(cap, frame_sample_interval, duration, progress_callback)
+            )
+        finally:
+            cap.release()
+            # Note: 此处不调用 torch.cuda.empty_cache()
+            #   缓存分配器保留的显存块可被下一个任务直接复用，
+            #   频繁归还驱动只会让下个任务重新分配；服务关闭时统一释放
+    
+    def _iter_sampled_frames(
+        self,
+        cap: cv2.VideoCapture,
+        frame_sample_interval: int,
+        duration: float,
+        progress_callback: Optional[Callable[[int, str], None]] = None
+    ) -> Generator[Tuple[float, int, np.ndarray], None, None]:
+        """
+        从 VideoCapture 中按帧间隔采样
+        
+        Args:
+            cap: 已打开的 VideoCapture
+            frame_sample_interval: 采样间隔 (帧数)
+            duration: 视频总时长 (秒)，用于计算进度
+            progress_callback: 进度回调函数
+        
+        Yields:
+            Tuple[float, int, np.ndarray]: (时间戳秒, 帧索引, BGR 帧)
+        """
+        frame_idx = 0                          # 当前读取帧索引
+        sampled_count = 0                      # 已采样帧数
+        
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
             
-            frame_idx = 0                          # 当前读取帧索引
-            sampled_count = 0                      # 已采样帧数
-            total_scenes = 0                       # 总场景数 (用于日志)
+            # ========== 跳帧采样 ==========
+            if frame_idx % frame_sample_interval != 0:
+                frame_idx += 1
+                continue
             
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                # ========== 跳帧采样 ==========
-                if frame_idx % frame_sample_interval != 0:
-                    frame_idx += 1
-                    continue
-                
-                sampled_count += 1
-                
-                # ========== 获取当前帧时间戳 (秒) ==========
-                # Why 使用 CAP_PROP_POS_MSEC?
-                #   比 frame_idx / fps 更准确，尤其对于 VFR 视频
-                current_ts = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
-                
-                # 进度回调 (每 10 次采样更新一次)
-                if progress_callback and sampled_count % 10 == 0:
-                    percent = int((current_ts / duration) * 100) if duration > 0 else 0
-                    progress_callback(percent, f"L1+L2 分析: {current_ts:.1f}s / {duration:.1f}s")
-                
-                # 转换到 GPU 张量
-                current_tensor = self._frame_to_tensor(frame)
-                
-                # 计算当前帧清晰度 (无论是否切换场景都要算，用于择优)
+            sampled_count += 1
+            
+            # ========== 获取当前帧时间戳 (秒) ==========
+            # Why 使用 CAP_PROP_POS_MSEC?
+            #   比 frame_idx / fps 更准确，尤其对于 VFR 视频
+            current_ts = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            
+            # 进度回调 (每 10 次采样更新一次)
+            if progress_callback and sampled_count % 10 == 0:
+                percent = int((current_ts / duration) * 100) if duration > 0 else 0
+                progress_callback(percent, f"L1+L2 分析: {current_ts:.1f}s / {duration:.1f}s")
+            
+            yield current_ts, frame_idx, frame
+            frame_idx += 1
+    
+    def extract_best_shots_from_frames(
+        self,
+        frames: Iterable[Tuple[float, int, np.ndarray]]
+    ) -> Generator[BestShot, None, None]:
+        """
+        L1+L2 核心: 在已采样的帧序列上提取每个场景的"冠军帧"
+        
+        算法流程:
+            1. 实时计算帧间差异 (L1)
+            2. 当差异超过阈值，标记为新场景
+            3. 对上一个场景，选出清晰度最高的帧 (L2)
+            4. 场景持续时间不足 min_scene_duration 的，视为"动态片段"丢弃
+        
+        Args:
+            frames: 已按采样间隔抽取的帧序列
+                - 元素为 (时间戳秒, 帧索引, BGR 帧)
+                - 可来自 OpenCV 读取，也可来自 FFmpeg 原始帧管道
+        
+        Yields:
+            BestShot: 每个有效场景的冠军帧信息
+        """
+        # ========== 场景状态机 ==========
+        prev_tensor: Optional[torch.Tensor] = None
+        scene_start_ts: float = 0.0            # 当前场景起始时间戳
+        scene_best_ts: float = 0.0             # 当前场景最清晰帧时间戳
+        scene_best_frame_idx: int = 0          # 当前场景最清晰帧索引 (调试用)
+        scene_best_sharpness: float = -1.0     # 当前场景最高清晰度
+        scene_best_frame = None                # 当前场景最清晰帧画面 (随 BestShot 输出)
+        
+        last_ts: float = 0.0                   # 最后一个采样帧时间戳
+        total_scenes = 0                       # 总场景数 (用于日志)
+        
+        for current_ts, frame_idx, frame in frames:
+            last_ts = current_ts
+            
+            # 转换到 GPU 张量
+            current_tensor = self._frame_to_tensor(frame)
+            
+            # ========== 首帧初始化 ==========
+            if prev_tensor is None:
                 sharpness = self.compute_laplacian_sharpness(current_tensor)
+                prev_tensor = current_tensor
+                scene_start_ts = current_ts
+                scene_best_sharpness = sharpness
+                scene_best_ts = current_ts
+                scene_best_frame_idx = frame_idx
+                scene_best_frame = frame
+                continue
+            
+            # ========== L1 差异 + L2 清晰度 ==========
+            # 清晰度无论是否切换场景都要算 (用于择优)
+            # Why 合并取值?
+            #   每次 .item() 都是一次 GPU→CPU 同步，两个标量一起取回
+            #   每帧只同步一次，内核可连续排队执行
+            diff, sharpness = torch.stack((
+                self._mad_tensor(prev_tensor, current_tensor),
+                self._laplacian_variance_tensor(current_tensor)
+            )).tolist()
+            
+            # ========== 检测场景切换 ==========
+            if diff > self.diff_threshold:
+                # 场景结束，检查是否满足最小持续时间
+                scene_duration = current_ts - scene_start_ts
                 
-                # ========== 首帧初始化 ==========
-                if prev_tensor is None:
-                    prev_tensor = current_tensor
-                    scene_best_sharpness = sharpness
-                    scene_best_ts = current_ts
-                    scene_best_frame_idx = frame_idx
-                    frame_idx += 1
-                    continue
-                
-                # ========== L1: 计算帧间差异 ==========
-                diff = self.compute_frame_difference(prev_tensor, current_tensor)
-                
-                # ========== 检测场景切换 ==========
-                if diff > self.diff_threshold:
-                    # 场景结束，检查是否满足最小持续时间
-                    scene_duration = current_ts - scene_start_ts
-                    
-                    if scene_duration >= self.min_scene_duration:
-                        # 有效场景，输出冠军帧
-                        total_scenes += 1
-                        logger.debug(f"   🎯 场景 #{total_scenes} [{scene_start_ts:.2f}s-{current_ts:.2f}s] "
-                                   f"冠军帧 @ {scene_best_ts:.2f}s, 清晰度: {scene_best_sharpness:.4f}")
-                        
-                        yield BestShot(
-                            timestamp=scene_best_ts,
-                            frame_index=scene_best_frame_idx,
-                            sharpness_score=scene_best_sharpness,
-                            scene_start_ts=scene_start_ts,
-                            scene_end_ts=current_ts
-                        )
-                    else:
-                        # 持续时间不足，丢弃 (可能是动态视频片段)
-                        logger.debug(f"   ⏭️ 场景 [{scene_start_ts:.2f}s-{current_ts:.2f}s] 被丢弃: "
-                                   f"持续时间 {scene_duration:.2f}s < {self.min_scene_duration}s")
+                if scene_duration >= self.min_scene_duration:
+                    # 有效场景，输出冠军帧
+                    total_scenes += 1
+                    logger.debug(f"   🎯 场景 #{total_scenes} [{scene_start_ts:.2f}s-{current_ts:.2f}s] "
+                               f"冠军帧 @ {scene_best_ts:.2f}s, 清晰度: {scene_best_sharpness:.4f}")
                     
-                    # 重置场景状态
-                    scene_start_ts = current_ts
+                    yield BestShot(
+                        timestamp=scene_best_ts,
+                        frame_index=scene_best_frame_idx,
+                        sharpness_score=scene_best_sharpness,
+                        scene_start_ts=scene_start_ts,
+                        scene_end_ts=current_ts,
+                        frame=scene_best_frame
+                    )
+                else:
+                    # 持续时间不足，丢弃 (可能是动态视频片段)
+                    logger.debug(f"   ⏭️ 场景 [{scene_start_ts:.2f}s-{current_ts:.2f}s] 被丢弃: "
+                               f"持续时间 {scene_duration:.2f}s < {self.min_scene_duration}s")
+                
+                # 重置场景状态
+                scene_start_ts = current_ts
+                scene_best_sharpness = sharpness
+                scene_best_ts = current_ts
+                scene_best_frame_idx = frame_idx
+                scene_best_frame = frame
+            else:
+                # 同一场景内，更新冠军帧 (如果当前帧更清晰)
+                if sharpness > scene_best_sharpness:
                     scene_best_sharpness = sharpness
                     scene_best_ts = current_ts
                     scene_best_frame_idx = frame_idx
-                else:
-                    # 同一场景内，更新冠军帧 (如果当前帧更清晰)
-                    if sharpness > scene_best_sharpness:
-                        scene_best_sharpness = sharpness
-                        scene_best_ts = current_ts
-                        scene_best_frame_idx = frame_idx
-                
-                prev_tensor = current_tensor
-                frame_idx += 1
+                    scene_best_frame = frame
             
-            # ========== 处理最后一个场景 ==========
-            final_ts = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
-            scene_duration = final_ts - scene_start_ts if final_ts > scene_start_ts else duration - scene_start_ts
+            prev_tensor = current_tensor
+        
+        # ========== 处理最后一个场景 ==========
+        # 最后一个采样帧覆盖到下一个采样点为止
+        if prev_tensor is not None:
+            final_ts = last_ts + self.sample_interval
+            scene_duration = final_ts - scene_start_ts
             
             if scene_duration >= self.min_scene_duration:
                 total_scenes += 1
@@ -368,17 +460,11 @@ class GPUFrameProcessor:
                     frame_index=scene_best_frame_idx,
                     sharpness_score=scene_best_sharpness,
                     scene_start_ts=scene_start_ts,
-                    scene_end_ts=final_ts
+                    scene_end_ts=final_ts,
+                    frame=scene_best_frame
                 )
-            
-            logger.success(f"✅ GPU 帧处理完成，共检测到 {total_scenes} 个有效场景")
-                
-        finally:
-            cap.release()
-            # 清理 GPU 缓存
-            if self.device.type == "cuda":
-                torch.cuda.empty_cache()
-                logger.debug("🧹 GPU 显存已清理")
+        
+        logger.success(f"✅ GPU 帧处理完成，共检测到 {total_scenes} 个有效场景")
     
     def get_frame_at_timestamp(self, video_path: Path, timestamp: float):
         """
@@ -432,3 +518,35 @@ class GPUFrameProcessor:
             return frame if ret else None
         finally:
             cap.release()
+
+
+# ============================================================
+#              共享实例管理
+# ============================================================
+@functools.lru_cache(maxsize=None)
+def get_frame_processor(
+    diff_threshold: float = 0.12,
+    min_scene_duration: float = 1.5,
+    sample_interval: float = 0.2,
+    device: str = "cuda"
+) -> GPUFrameProcessor:
+    """
+    获取 (按参数缓存的) GPU 帧处理器实例
+    
+    Why 共享实例?
+        - GPUFrameProcessor 本身无任务级状态，可安全复用
+        - 多个 VideoService 共享同一 CUDA 上下文和预加载的拉普拉斯核
+        - 避免每个任务重复初始化 GPU 资源
+    
+    Args:
+        与 GPUFrameProcessor.__init__ 相同
+    
+    Returns:
+        GPUFrameProcessor: 相同参数下的共享实例
+    """
+    return GPUFrameProcessor(
+        diff_threshold=diff_threshold,
+        min_scene_duration=min_scene_duration,
+        sample_interval=sample_interval,
+        device=device
+    )
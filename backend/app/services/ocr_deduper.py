@@ -10,15 +10,18 @@
     - PaddleOCR 单例模式，避免重复加载模型 (加载耗时约 3-5 秒)
     - Windows DLL 兼容性修复 (自动加载 zlibwapi.dll)
     - 使用模糊匹配容忍 OCR 识别误差
+    - 边缘密度前置过滤 + SimHash 预筛，减少 OCR 与文本比对开销
 
 依赖: paddleocr, paddlepaddle-gpu
 """
 import sys
 import os
+import hashlib
 from pathlib import Path
 from difflib import SequenceMatcher
 from typing import Optional, Tuple
 
+import cv2
 import numpy as np
 from loguru import logger
 
@@ -130,6 +133,77 @@ def get_ocr_instance():
     return _ocr_instance
 
 
+# ============================================================
+#              文本预处理与 SimHash
+# ============================================================
+# SimHash 分片长度 (字符) 与判重阈值 (汉明距离小于该值视为重复)
+SIMHASH_SHINGLE_SIZE = 7
+SIMHASH_DUPLICATE_DISTANCE = 3
+
+
+def _clean_text(text: str) -> str:
+    """
+    文本预处理: 去除空白字符，统一小写
+    
+    Why?
+        - PPT 翻页可能只是标点变化
+        - 大小写差异不应影响相似度判断
+    """
+    return "".join(text.lower().split())
+
+
+def _simhash64(text_clean: str) -> int:
+    """
+    计算预处理后文本的 64 位 SimHash
+    
+    以 7 字符滑动分片为特征，每个分片取 64 位 blake2b 摘要，
+    按位多数投票得到指纹。文本越接近，指纹汉明距离越小。
+    
+    Args:
+        text_clean: 预处理后的文本 (非空)
+    
+    Returns:
+        int: 64 位指纹
+    """
+    k = SIMHASH_SHINGLE_SIZE
+    shingles = [text_clean[i:i + k] for i in range(max(1, len(text_clean) - k + 1))]
+    digests = b"".join(
+        hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest() for sh in shingles
+    )
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(-1, 64)
+    majority = bits.sum(axis=0) * 2 > len(shingles)
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+# ============================================================
+#              文本相似度
+# ============================================================
+def _clean_text_similarity(text1_clean: str, text2_clean: str) -> float:
+    """
+    计算两段预处理后文本的相似度
+    
+    calculate_similarity 与 is_duplicate 共用此函数，保证两者判定一致。
+    
+    Args:
+        text1_clean: 预处理后的第一段文本
+        text2_clean: 预处理后的第二段文本
+    
+    Returns:
+        float: 相似度分数 (0-1)
+    """
+    if not text1_clean or not text2_clean:
+        # 如果有一方为空，无法判断相似性
+        # 返回 0 表示"不相似"，让调用方决定如何处理
+        return 0.0
+    
+    # 完全相同的文本无需比对
+    if text1_clean == text2_clean:
+        return 1.0
+    
+    # SequenceMatcher.ratio() 返回 0-1 的相似度
+    return SequenceMatcher(None, text1_clean, text2_clean).ratio()
+
+
 # ============================================================
 #              OCR 语义去重器
 # ============================================================
@@ -142,13 +216,15 @@ class OCRDeduper:
     工作流程:
         1. 对输入帧执行 OCR，提取文本内容
         2. 与上一张已保存页面的文本比对
-        3. 使用 SequenceMatcher 计算相似度
-        4. 相似度超过阈值则判定为重复页面
+        3. SimHash 指纹几乎相同则直接判定为重复
+        4. 否则使用 SequenceMatcher 计算相似度，超过阈值判定为重复页面
     
     Attributes:
         similarity_threshold: 文本相似度阈值 (0-1)
         ocr: PaddleOCR 单例实例
         _last_saved_text: 上一张已保存页面的文本 (用于去重比对)
+        _last_saved_simhash: 上一张已保存页面文本的 SimHash 指纹
+        _last_saved_clean: 上一张已保存页面的预处理文本 (保存时计算一次)
     
     Example:
         >>> deduper = OCRDeduper(similarity_threshold=0.90)
@@ -158,6 +234,9 @@ class OCRDeduper:
         ...     deduper.mark_as_saved(text)
     """
     
+    # 边缘像素占比低于此值的帧视为无文字内容 (纯色/转场画面)，跳过 OCR
+    MIN_EDGE_DENSITY = 0.002
+    
     def __init__(self, similarity_threshold: float = 0.90) -> None:
         """
         初始化 OCR 去重器
@@ -172,8 +251,10 @@ class OCRDeduper:
         self.similarity_threshold = similarity_threshold
         self.ocr = get_ocr_instance()
         
-        # 缓存上一张已保存页面的文本
+        # 缓存上一张已保存页面的文本及其 SimHash 指纹
         self._last_saved_text: Optional[str] = None
+        self._last_saved_simhash: Optional[int] = None
+        self._last_saved_clean: str = ""
         
         logger.debug(f"⚙️ OCR 去重器初始化: similarity_threshold={similarity_threshold}")
     
@@ -187,6 +268,10 @@ class OCRDeduper:
         Returns:
             str: 提取的全部文本，以空格连接
         """
+        if self._is_textless(frame):
+            logger.debug("   📝 边缘密度过低，判定为无文字画面，跳过 OCR")
+            return ""
+        
         try:
             # PaddleOCR 返回格式: [[box, (text, confidence)], ...]
             result = self.ocr.ocr(frame, cls=True)
@@ -212,6 +297,24 @@ class OCRDeduper:
             logger.warning(f"⚠️ OCR 提取失败: {e}")
             return ""
     
+    def _is_textless(self, frame: np.ndarray) -> bool:
+        """
+        廉价启发式: 判断帧是否几乎不可能包含文字
+        
+        文字笔画会产生大量边缘，边缘像素占比极低的画面
+        (黑屏、纯色转场等) 无需运行 OCR 模型。
+        
+        Args:
+            frame: OpenCV BGR 格式的图像
+            
+        Returns:
+            bool: True 表示可直接视为无文字
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        edged = cv2.Canny(gray, 50, 150)
+        edge_density = cv2.countNonZero(edged) / edged.size
+        return edge_density < self.MIN_EDGE_DENSITY
+    
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """
         计算两段文本的相似度
@@ -230,21 +333,8 @@ class OCRDeduper:
         Returns:
             float: 相似度分数 (0-1)，越高越相似
         """
-        if not text1 or not text2:
-            # 如果有一方为空，无法判断相似性
-            # 返回 0 表示"不相似"，让调用方决定如何处理
-            return 0.0
-        
         # 预处理: 去除空白字符，统一小写
-        # Why?
-        #   - PPT 翻页可能只是标点变化
-        #   - 大小写差异不应影响相似度判断
-        text1_clean = "".join(text1.lower().split())
-        text2_clean = "".join(text2.lower().split())
-        
-        # SequenceMatcher.ratio() 返回 0-1 的相似度
-        similarity = SequenceMatcher(None, text1_clean, text2_clean).ratio()
-        return similarity
+        return _clean_text_similarity(_clean_text(text1), _clean_text(text2))
     
     def is_duplicate(self, frame: np.ndarray) -> Tuple[bool, str]:
         """
@@ -252,8 +342,8 @@ class OCRDeduper:
         
         核心去重逻辑:
             1. 提取当前帧文本 (PaddleOCR)
-            2. 与缓存的上一页文本比对
-            3. 相似度超过阈值则判定为重复
+            2. SimHash 预筛: 与上一页指纹汉明距离 < 3 直接判定为重复
+            3. 否则与缓存的上一页文本比对，相似度超过阈值则判定为重复
         
         Args:
             frame: 当前帧图像 (OpenCV BGR)
@@ -267,12 +357,22 @@ class OCRDeduper:
         
         # 首帧无历史对比，直接判定为新页面
         if self._last_saved_text is None:
-            self._last_saved_text = current_text
+            self.mark_as_saved(current_text)
             logger.debug("   🆕 首帧，无历史对比")
             return False, current_text
         
+        # ----- SimHash 预筛 -----
+        # Why? 指纹比对只需一次异或 + popcount，近乎相同的文本无需序列比对
+        current_clean = _clean_text(current_text)
+        if current_clean and self._last_saved_simhash is not None:
+            distance = (_simhash64(current_clean) ^ self._last_saved_simhash).bit_count()
+            if distance < SIMHASH_DUPLICATE_DISTANCE:
+                logger.debug(f"   🔄 重复页面检测: SimHash 汉明距离 {distance} < {SIMHASH_DUPLICATE_DISTANCE}")
+                return True, current_text
+        
         # 计算与上一保存页的相似度
-        similarity = self.calculate_similarity(self._last_saved_text, current_text)
+        # 直接复用保存时预处理好的上一页文本与上面算好的 current_clean
+        similarity = _clean_text_similarity(self._last_saved_clean, current_clean)
         
         is_dup = similarity > self.similarity_threshold
         
@@ -281,7 +381,7 @@ class OCRDeduper:
         else:
             logger.debug(f"   ✨ 新页面检测: 相似度 {similarity:.1%} <= {self.similarity_threshold:.0%}")
             # 更新缓存 (只有保存时才更新)
-            self._last_saved_text = current_text
+            self.mark_as_saved(current_text)
         
         return is_dup, current_text
     
@@ -295,6 +395,11 @@ class OCRDeduper:
             text: 已保存页面的文本内容
         """
         self._last_saved_text = text
+        
+        # 上一页在下次保存前保持不变，预处理结果与指纹只在此处计算一次
+        text_clean = _clean_text(text)
+        self._last_saved_clean = text_clean
+        self._last_saved_simhash = _simhash64(text_clean) if text_clean else None
     
     def reset(self) -> None:
         """
@@ -303,4 +408,6 @@ class OCRDeduper:
         在开始处理新视频前调用，清除上一次任务的缓存。
         """
         self._last_saved_text = None
+        self._last_saved_simhash = None
+        self._last_saved_clean = ""
         logger.debug("🔄 OCR 去重器状态已重置")
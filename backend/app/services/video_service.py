@@ -3,45 +3,426 @@
 功能描述: 视频处理核心服务，实现 GPU 加速的 PPT 提取与音频转录编排
 核心逻辑:
     - _locate_ppt_region(): 使用 Canny 边缘检测定位视频中的 PPT 区域
-    - _generate_lightweight_video(): 生成轻量视频 (640px, 5fps) 用于加速分析
-    - _run_funnel_analysis(): 三层漏斗 PPT 提取 (L1帧差 + L2清晰度 + L3 OCR去重)
+    - _run_funnel_analysis(): 流式读取轻量帧 (640px, 5fps) 并执行三层漏斗 PPT 提取 (L1帧差 + L2清晰度 + L3 OCR去重)
     - _high_res_capture(): 高清回溯 - 从原视频截取最终画面
     - process(): 主入口，编排 PPT 提取与音频转录两个独立模块
 
 全链路架构 (Lightweight Media Workflow):
     1. Step 1.1: ROI Detection - 定位 PPT 区域
-    2. Step 1.2: Lightweight Video - 生成轻量视频 (640px, 5fps, 去音频)
-    3. Step 1.3: Funnel Analysis - 三层漏斗分析轻量视频
+    2. Step 1.2: Streaming Funnel - FFmpeg 管道输出轻量帧 (640px, 5fps)，边解码边分析
        - L1: 帧差检测 (场景分割)
        - L2: 清晰度择优 (选冠军帧)
        - L3: OCR 语义去重 (过滤重复页 + 非PPT页面)
-    4. Step 1.4: High-Res Capture - 从原视频高清回溯
+    3. Step 1.3: High-Res Capture - 从原视频高清回溯
 
 设计亮点:
     - **Timestamp First**: 所有逻辑基于时间戳 (秒 float)，严禁依赖 frame_index
-    - 轻量视频分析 (快速) + 原视频截取 (高清) 分离
+    - 轻量帧分析 (快速) + 原视频截取 (高清) 分离
+    - 轻量帧经 rawvideo 管道直达分析器，不落盘、不二次解码
     - Generator 模式流式输出，支持实时进度更新
-    - 流程结束自动清理临时文件 (轻量视频)
+    - 流程结束自动清理临时目录
 """
 import cv2
+import hashlib
+import json
+import os
+import queue
 import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Iterable, Iterator, Optional, Tuple, TypeVar
 
-from pptx import Presentation
+import numpy as np
 from pptx.util import Inches
 from loguru import logger
 
-from app.core.config import OUTPUT_DIR, TEMP_DIR
+from app.core.config import CACHE_DIR, DEBUG_IMAGES_ENABLED, OUTPUT_DIR, TEMP_DIR
 from app.core.task_manager import update_task_progress
 from app.services.audio_service import get_audio_transcriber
-from app.services.gpu_frame_processor import GPUFrameProcessor, BestShot
+from app.services.gpu_frame_processor import BestShot, get_frame_processor
 from app.services.ocr_deduper import OCRDeduper
 from app.utils.ffmpeg_utils import (
-    generate_lightweight_video,
-    extract_frame_at_timestamp,
+    stream_lightweight_frames,
     extract_frames_batch
 )
+from app.utils.pptx_utils import build_image_pptx
+
+
+# ============================================================
+#              流水线参数
+# ============================================================
+# dHash 汉明距离阈值: 不超过该值视为与上一保存页视觉相同，跳过 OCR
+# 取值偏严: 同模板幻灯片仅几行文字不同时 dHash 差异很小，误判会直接丢页，
+# 而漏判只是多做一次 OCR (仍由 OCRDeduper 兜底)
+DHASH_DUPLICATE_DISTANCE = 3
+
+# ROI 定位时的分析宽度 (px): 采样帧先缩放到此宽度再做边缘检测
+ROI_DETECT_WIDTH = 320
+
+# ROI 定位采样点 (视频时长比例): 首选点命中即返回，失败才并行分析其余点
+# Why 40% 优先? 讲座视频开头常为片头/讲者特写，中段几乎总是 PPT 画面
+ROI_SAMPLE_POINTS = (0.4, 0.2, 0.6)
+
+# 读取下一回退采样点前，等待上一采样点分析结果的最长时间 (秒)
+# 320px 的 Canny + 轮廓分析通常数毫秒内完成，命中则省去后续 seek 与解码
+ROI_PREV_ANALYSIS_WAIT = 0.05
+
+# ROI 定位结果缓存: 同一视频内容重复上传时跳过定位
+ROI_CACHE_PATH = CACHE_DIR / "roi.json"
+ROI_CACHE_MAX_ENTRIES = 1024
+
+# L3 队列上限: L1+L2 领先 L3 的最大候选数，避免 OCR 慢于解码时帧堆积在内存
+L3_MAX_PENDING = 8
+
+# 子阶段进度回调的最小上报间隔 (秒): 每秒最多 5 次
+PROGRESS_MIN_INTERVAL = 0.2
+
+# 轻量帧预读队列长度: 解码线程领先 L1+L2 的最大帧数
+FRAME_PREFETCH_SIZE = 4
+
+
+# ============================================================
+#              流水线预读
+# ============================================================
+T = TypeVar("T")
+
+_PREFETCH_END = object()
+
+
+def _prefetch(items: Iterable[T], maxsize: int) -> Iterator[T]:
+    """
+    在后台线程中预先迭代 items，通过有界队列交给调用方消费
+    
+    Why?
+        轻量帧 (640x360 BGR 约 690KB) 远大于管道缓冲区，
+        若在同一线程读取，GPU 帧差计算期间 FFmpeg 会被写阻塞而停止解码。
+        后台线程持续读管道，解码与 L1+L2 计算即可重叠；
+        有界队列提供背压，避免帧在内存中堆积。
+    
+    Args:
+        items: 被预读的可迭代对象 (通常为生成器)
+        maxsize: 队列长度上限
+    
+    Yields:
+        与 items 相同的元素 (顺序不变)，生产端异常会在消费端重新抛出
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        """阻塞放入队列，消费端提前退出时放弃"""
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce() -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put(item):
+                    break
+            put(_PREFETCH_END)
+        except BaseException as e:
+            put(e)
+        finally:
+            # 在生产线程内关闭生成器，触发其 finally 清理 (如终止 FFmpeg 进程)
+            close = getattr(iterator, "close", None)
+            if close:
+                close()
+    
+    producer = threading.Thread(target=produce, name="frame-prefetch", daemon=True)
+    producer.start()
+    
+    try:
+        while True:
+            item = buffer.get()
+            if item is _PREFETCH_END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+# ============================================================
+#              ROI 定位结果缓存
+# ============================================================
+_roi_cache_lock = threading.Lock()
+_roi_cache: Optional[dict] = None
+
+
+def _video_fingerprint(video_path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    计算视频内容指纹 (文件大小 + 首尾各 1MB 的 blake2b)
+    
+    Why 不用路径 + mtime?
+        上传文件以随机文件名保存且处理后即删除，
+        路径与修改时间每次都不同，只有内容能识别重复上传。
+    
+    Args:
+        video_path: 视频路径
+        chunk_size: 首尾各读取的字节数
+    
+    Returns:
+        str: 十六进制指纹
+    """
+    size = video_path.stat().st_size
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(video_path, "rb") as f:
+        digest.update(f.read(chunk_size))
+        if size > chunk_size:
+            f.seek(max(chunk_size, size - chunk_size))
+            digest.update(f.read(chunk_size))
+    return digest.hexdigest()
+
+
+def _load_roi_cache() -> dict:
+    """
+    获取 ROI 缓存字典 (调用方需持有 _roi_cache_lock)
+    
+    首次调用时从磁盘读取，之后常驻内存，查询无需再解析 JSON。
+    文件不存在或损坏时视为空缓存。
+    """
+    global _roi_cache
+    
+    if _roi_cache is None:
+        try:
+            with open(ROI_CACHE_PATH, "r", encoding="utf-8") as f:
+                _roi_cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _roi_cache = {}
+    return _roi_cache
+
+
+def _get_cached_roi(fingerprint: str) -> Optional[Tuple[int, int, int, int]]:
+    """按内容指纹查询已缓存的 PPT 区域"""
+    with _roi_cache_lock:
+        bbox = _load_roi_cache().get(fingerprint)
+    return tuple(bbox) if bbox else None
+
+
+def _save_cached_roi(fingerprint: str, bbox: Tuple[int, int, int, int]) -> None:
+    """写入 PPT 区域缓存 (先写临时文件再原子替换，避免并发任务读到半截 JSON)"""
+    with _roi_cache_lock:
+        cache = _load_roi_cache()
+        cache.pop(fingerprint, None)
+        cache[fingerprint] = [int(v) for v in bbox]
+        
+        # 超出上限时按写入顺序淘汰最旧的条目
+        while len(cache) > ROI_CACHE_MAX_ENTRIES:
+            del cache[next(iter(cache))]
+        
+        tmp_path = ROI_CACHE_PATH.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, ROI_CACHE_PATH)
+
+
+# ============================================================
+#              ROI 边缘检测: OpenCV CUDA / OpenCL 加速
+# ============================================================
+def _check_cv2_cuda_available() -> bool:
+    """
+    检测 OpenCV 是否编译了 CUDA 模块且存在可用设备
+    
+    Returns:
+        bool: True 表示可使用 cv2.cuda 滤镜
+    """
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+CV2_CUDA_AVAILABLE = _check_cv2_cuda_available()
+
+
+def _check_cv2_opencl_available() -> bool:
+    """
+    检测 OpenCV 透明 API (T-API) 是否可使用 OpenCL 设备
+    
+    Returns:
+        bool: True 表示 cv2.UMat 上的滤镜会在 OpenCL 设备上执行
+    """
+    try:
+        return cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+    except (AttributeError, cv2.error):
+        return False
+
+
+CV2_OPENCL_AVAILABLE = _check_cv2_opencl_available()
+
+# CUDA 高斯/Canny 滤镜 (首次使用时创建，全局复用)
+# Why 加锁? 滤镜对象内部持有显存缓冲区，不能被多个线程同时使用
+_cuda_edge_filters = None
+_cuda_edge_lock = threading.Lock()
+
+# CUDA Canny 在图像边界处会产生伪边缘，处理前先填充若干像素，处理后裁掉
+_CUDA_EDGE_PAD = 2
+
+
+def _detect_edges(gray: np.ndarray) -> np.ndarray:
+    """
+    高斯模糊 + Canny 边缘检测
+    
+    优先级: cv2.cuda (GPU) → cv2.UMat (OpenCL) → CPU。
+    
+    Args:
+        gray: 灰度图
+    
+    Returns:
+        np.ndarray: Canny 边缘图 (与输入同尺寸)
+    """
+    global _cuda_edge_filters
+    
+    if CV2_CUDA_AVAILABLE:
+        pad = _CUDA_EDGE_PAD
+        padded = cv2.copyMakeBorder(gray, pad, pad, pad, pad, cv2.BORDER_REPLICATE)
+        
+        with _cuda_edge_lock:
+            if _cuda_edge_filters is None:
+                _cuda_edge_filters = (
+                    cv2.cuda.createGaussianFilter(cv2.CV_8UC1, cv2.CV_8UC1, (5, 5), 0),
+                    cv2.cuda.createCannyEdgeDetector(30, 120),
+                )
+            gauss, canny = _cuda_edge_filters
+            
+            gpu_gray = cv2.cuda_GpuMat()
+            gpu_gray.upload(padded)
+            edged = canny.detect(gauss.apply(gpu_gray)).download()
+        
+        return edged[pad:-pad, pad:-pad]
+    
+    if CV2_OPENCL_AVAILABLE:
+        # UMat 上的 GaussianBlur/Canny 由 T-API 自动派发到 OpenCL 设备，
+        # findContours 需要普通 Mat，最后 .get() 取回内存
+        blurred = cv2.GaussianBlur(cv2.UMat(gray), (5, 5), 0)
+        return cv2.Canny(blurred, 30, 120).get()
+    
+    # Step 1: 高斯模糊 (去噪，平滑边缘)
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    
+    # Step 2: Canny 边缘检测
+    # Why (30, 120)? 低阈值 30 检测弱边缘，高阈值 120 过滤噪点
+    return cv2.Canny(blurred, 30, 120)
+
+
+def _dhash64(gray_small: np.ndarray) -> int:
+    """
+    计算 64 位差值哈希 (dHash)
+    
+    比较 9x8 灰度缩略图中水平相邻像素的亮度大小，
+    得到 8x8 = 64 个比特并打包为整数。
+    
+    Args:
+        gray_small: 9x8 (宽x高) 的灰度缩略图
+    
+    Returns:
+        int: 64 位哈希值
+    """
+    diff = gray_small[:, 1:] > gray_small[:, :-1]
+    return int.from_bytes(np.packbits(diff).tobytes(), "big")
+
+
+def _analyze_frame(
+    frame: np.ndarray,
+    index: int,
+    debug_dir: Optional[Path] = None
+) -> Optional[Tuple[Tuple[int, int, int, int], np.ndarray, float]]:
+    """
+    分析单个采样帧，寻找 PPT 四边形区域 (Canny + 轮廓分析)
+    
+    模块级纯函数，不依赖实例状态，可安全地在线程池中并行执行。
+    
+    Why 先缩放?
+        Canny/findContours 的耗时与像素数成正比，
+        PPT 边框这种大尺度结构在 320px 宽度下依然清晰，
+        检测完成后再把顶点坐标按比例还原到原分辨率。
+    
+    Args:
+        frame: OpenCV BGR 格式的采样帧
+        index: 采样点序号 (用于区分调试图像文件名)
+        debug_dir: 调试图像目录，为 None 时不保存
+    
+    Returns:
+        tuple: (bbox, approx, area_ratio)，未找到有效区域返回 None
+            - bbox: (x, y, w, h) PPT 区域坐标和尺寸
+            - approx: 近似四边形顶点 (原分辨率坐标，用于绘制调试图)
+            - area_ratio: 区域面积占整帧比例
+    """
+    # 保存调试图像 (可视化边缘检测过程)
+    # Why .npy? 中间图仅供排查使用，原始像素转储省去 JPEG 编码开销
+    if debug_dir is not None:
+        np.save(debug_dir / f"{index}_0_original.npy", frame)
+    
+    # ----- 降采样 -----
+    orig_h, orig_w = frame.shape[:2]
+    scale = orig_w / ROI_DETECT_WIDTH if orig_w > ROI_DETECT_WIDTH else 1.0
+    if scale > 1.0:
+        small = cv2.resize(
+            frame,
+            (ROI_DETECT_WIDTH, max(1, round(orig_h / scale))),
+            interpolation=cv2.INTER_AREA
+        )
+    else:
+        small = frame
+    
+    # ----- Canny 边缘检测流水线 -----
+    # Step 1: BGR -> Gray (减少计算量)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    if debug_dir is not None:
+        np.save(debug_dir / f"{index}_1_gray.npy", gray)
+    
+    # Step 2: 高斯模糊 + Canny 边缘检测 (有 CUDA 时在 GPU 上执行)
+    edged = _detect_edges(gray)
+    if debug_dir is not None:
+        np.save(debug_dir / f"{index}_2_edged.npy", edged)
+    
+    # ----- 轮廓分析 -----
+    # OpenCV 4.x 的 findContours 不再修改输入图像，无需 .copy()
+    contours, _ = cv2.findContours(
+        edged, 
+        cv2.RETR_EXTERNAL,      # 只检测外轮廓
+        cv2.CHAIN_APPROX_SIMPLE  # 压缩轮廓点
+    )
+    
+    if not contours:
+        return None
+    
+    frame_area = small.shape[0] * small.shape[1]
+    
+    # 面积只计算一次，先用向量化掩码剔除面积占比 <= 10% 的轮廓，
+    # 再按面积降序取前 5 个 (PPT 通常是最大的矩形区域)
+    area_ratios = np.fromiter(
+        (cv2.contourArea(c) for c in contours), dtype=np.float64, count=len(contours)
+    ) / frame_area
+    candidates = np.flatnonzero(area_ratios > 0.1)
+    if candidates.size == 0:
+        return None
+    top_indices = candidates[np.argsort(area_ratios[candidates])[::-1][:5]]
+    
+    for i in top_indices:
+        c = contours[i]
+        # 轮廓近似: 减少顶点数量
+        peri = cv2.arcLength(c, True)
+        approx = cv2.approxPolyDP(c, 0.03 * peri, True)
+        
+        # 必须是 4 边形 (PPT 是矩形)，面积已在上方筛选
+        if len(approx) == 4:
+            # 顶点坐标还原到原分辨率
+            approx = np.round(approx * scale).astype(np.int32)
+            return cv2.boundingRect(approx), approx, float(area_ratios[i])
+    
+    return None
 
 
 class VideoService:
@@ -52,9 +433,8 @@ class VideoService:
     
     核心流程 (Lightweight Media Workflow):
         1. 定位 PPT 区域 (ROI Detection)
-        2. 生成轻量视频 (640px, 5fps)
-        3. 在轻量视频上运行三层漏斗分析
-        4. 用时间戳回溯原视频截取高清画面
+        2. 流式读取轻量帧 (640px, 5fps) 并运行三层漏斗分析
+        3. 用时间戳回溯原视频截取高清画面
     
     Attributes:
         output_guid: 任务唯一标识，用于组织输出目录
@@ -79,17 +459,22 @@ class VideoService:
         self.base_output_path = OUTPUT_DIR / output_guid
         
         # 定义子目录结构
-        # 轻量视频临时目录：放入 temp 下，流程结束后自动清理
+        # 任务临时目录：放入 temp 下，流程结束后自动清理
         self.temp_video_dir = TEMP_DIR / output_guid
         self.debug_images_dir = self.base_output_path / "debug_images"
         self.ppt_images_dir = self.base_output_path / "ppt_images"
         self.ppt_output_dir = self.base_output_path / "ppt_output"
         self.transcripts_dir = self.base_output_path / "transcripts"
         
+        # 调试图仅在显式开启时输出 (见 config.DEBUG_IMAGES_ENABLED)
+        self.debug_enabled = DEBUG_IMAGES_ENABLED
+        
         # 创建所需文件夹
-        for p in [self.temp_video_dir, self.debug_images_dir, 
-                  self.ppt_images_dir, self.ppt_output_dir, self.transcripts_dir]:
+        for p in [self.temp_video_dir, self.ppt_images_dir, 
+                  self.ppt_output_dir, self.transcripts_dir]:
             p.mkdir(parents=True, exist_ok=True)
+        if self.debug_enabled:
+            self.debug_images_dir.mkdir(parents=True, exist_ok=True)
         
         logger.debug(f"📁 输出目录已创建: {self.base_output_path}")
         logger.debug(f"📁 临时目录已创建: {self.temp_video_dir}")
@@ -99,18 +484,28 @@ class VideoService:
         #   diff_threshold: 帧间差异阈值，超过此值视为场景切换
         #   min_scene_duration: 场景最短持续时间，过滤动态视频片段
         #   sample_interval: 采样间隔 (秒)，每 0.2 秒取一次样 (每秒 5 个点)
-        self.frame_processor = GPUFrameProcessor(
+        # Why get_frame_processor? 跨任务共享实例，CUDA 上下文与显存缓存常驻
+        self.frame_processor = get_frame_processor(
             diff_threshold=0.05,
             min_scene_duration=1,
             sample_interval=0.2  # 每 0.2 秒采样一次
         )
         
         # ========== 初始化 OCR 去重器 (L3) ==========
+        # Note: OCR 模型权重已由 get_ocr_instance() 全局共享，
+        #   去重器本身持有任务级状态 (上一页文本)，因此每个任务独立创建
         # 参数说明:
         #   similarity_threshold: 文本相似度阈值，超过则判定为重复页
         self.ocr_deduper = OCRDeduper(
             similarity_threshold=0.90
         )
+        
+        # 上一保存页面的 dHash (L3 前置过滤，命中则跳过 OCR)
+        # Why 只比对上一页? 与 OCRDeduper 一致，讲者翻回旧页 (A→B→A) 时应再次保留
+        self._last_saved_hash: Optional[int] = None
+        
+        # 上次上报子阶段进度的时间 (time.monotonic)
+        self._last_progress_t = 0.0
 
     def process(
         self, 
@@ -122,7 +517,7 @@ class VideoService:
         视频处理主入口: 编排 PPT 提取与音频转录两个独立模块
         
         两个功能模块完全解耦，可独立启用或同时启用。
-        进度条会根据启用的模块数量自动分配区间。
+        同时启用时音频转录在后台线程提前启动，与 PPT 提取并行执行。
         
         Args:
             input_video_path: 原始视频文件路径
@@ -151,99 +546,98 @@ class VideoService:
         transcript_path = None
         
         # ============================================================
-        #               模块 1: PPT 提取 (条件执行)
+        #               模块 2: 音频转录 (后台提前启动，与 PPT 提取并行)
         # ============================================================
-        if enable_ppt_extraction:
-            logger.info("📊 [PPT 提取模块] 开始执行 (Lightweight Media Workflow)...")
-            
-            # 进度区间分配:
-            #   - 若同时启用音频: PPT 占 0-85%, 音频占 85-100%
-            #   - 若仅 PPT: PPT 占 0-100%
-            ppt_progress_end = 85 if enable_audio_transcription else 100
-            
-            # ----- Step 1.1: 定位 PPT 区域 -----
-            update_task_progress(self.output_guid, 5, "正在定位 PPT 区域...")
-            logger.info("🔍 Step 1.1: 定位 PPT 区域 (Canny 边缘检测)")
-            
-            bbox = self._locate_ppt_region(input_video_path)
-            
-            if not bbox:
-                logger.error("❌ 无法定位 PPT 区域")
-                raise ValueError("无法定位 PPT 区域，请确保视频中包含清晰的 PPT 画面")
-            
-            logger.success(f"✅ PPT 区域定位成功: x={bbox[0]}, y={bbox[1]}, w={bbox[2]}, h={bbox[3]}")
-            
-            # ----- Step 1.2: 生成轻量视频 -----
-            update_task_progress(self.output_guid, 10, "正在生成轻量视频 (GPU 加速)...")
-            logger.info("🎥 Step 1.2: 生成轻量视频 (640px, 5fps)")
-            
-            lightweight_video_path = self._generate_lightweight_video(input_video_path, bbox)
-            
-            if not lightweight_video_path:
-                logger.error("❌ 轻量视频生成失败")
-                raise ValueError("轻量视频生成失败")
-            
-            logger.success(f"✅ 轻量视频生成完成: {lightweight_video_path.name}")
-            
-            # ----- Step 1.3: 三层漏斗分析 -----
-            update_task_progress(self.output_guid, 25, "正在进行三层漏斗分析...")
-            logger.info("🎯 Step 1.3: 三层漏斗分析 (L1→L2→L3)")
-            
-            final_timestamps = self._run_funnel_analysis(lightweight_video_path)
-            
-            logger.info(f"📊 漏斗分析结果: 共 {len(final_timestamps)} 个有效时间点")
-            
-            if not final_timestamps:
-                logger.warning("⚠️ 未检测到任何有效 PPT 页面")
-                ppt_path = None
-            else:
-                # ----- Step 1.4: 高清回溯 -----
-                update_task_progress(self.output_guid, 70, "正在高清回溯截取...")
-                logger.info("📸 Step 1.4: 高清回溯 (从原视频截取)")
+        # Why 并行? 音频解码 + ASR 与 PPT 流水线 (FFmpeg/OpenCV/OCR) 资源基本不重叠，
+        #   总耗时由 ppt + audio 降为 max(ppt, audio)
+        audio_executor: Optional[ThreadPoolExecutor] = None
+        audio_future = None
+        if enable_audio_transcription:
+            logger.info("🎤 [音频转录模块] 后台启动 (与 PPT 提取并行)...")
+            logger.info("🔊 调用 FunASR 进行本地语音识别...")
+            audio_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-asr")
+            audio_future = audio_executor.submit(
+                get_audio_transcriber().transcribe_video, 
+                input_video_path
+            )
+        
+        try:
+            # ============================================================
+            #               模块 1: PPT 提取 (条件执行)
+            # ============================================================
+            if enable_ppt_extraction:
+                logger.info("📊 [PPT 提取模块] 开始执行 (Lightweight Media Workflow)...")
                 
-                ppt_path = self._high_res_capture(
-                    source_video=input_video_path,
-                    timestamps=final_timestamps,
-                    crop_bbox=bbox
-                )
+                # ----- Step 1.1: 定位 PPT 区域 -----
+                update_task_progress(self.output_guid, 5, "正在定位 PPT 区域...")
+                logger.info("🔍 Step 1.1: 定位 PPT 区域 (Canny 边缘检测)")
+                
+                bbox = self._locate_ppt_region(input_video_path)
+                
+                if not bbox:
+                    logger.error("❌ 无法定位 PPT 区域")
+                    raise ValueError("无法定位 PPT 区域，请确保视频中包含清晰的 PPT 画面")
+                
+                logger.success(f"✅ PPT 区域定位成功: x={bbox[0]}, y={bbox[1]}, w={bbox[2]}, h={bbox[3]}")
+                
+                # ----- Step 1.2: 流式三层漏斗分析 -----
+                update_task_progress(self.output_guid, 10, "正在进行三层漏斗分析...")
+                logger.info("🎯 Step 1.2: 流式三层漏斗分析 (640px, 5fps, L1→L2→L3)")
+                
+                final_timestamps = self._run_funnel_analysis(input_video_path, bbox)
+                
+                logger.info(f"📊 漏斗分析结果: 共 {len(final_timestamps)} 个有效时间点")
                 
-                if ppt_path:
-                    logger.success(f"✅ PPT 生成完成: {ppt_path.name}")
+                if not final_timestamps:
+                    logger.warning("⚠️ 未检测到任何有效 PPT 页面")
+                    ppt_path = None
                 else:
-                    logger.warning("⚠️ PPT 生成失败")
-        
-        # ============================================================
-        #               模块 2: 音频转录 (条件执行，完全独立)
-        # ============================================================
-        if enable_audio_transcription:
-            logger.info("🎤 [音频转录模块] 开始执行...")
-            
-            # 进度区间:
-            #   - 若同时启用 PPT: 从 85% 开始
-            #   - 若仅音频: 从 0% 开始
-            audio_progress_start = 85 if enable_ppt_extraction else 0
-            
-            update_task_progress(
-                self.output_guid, 
-                audio_progress_start + 5, 
-                "正在进行语音识别 (FunASR)..."
-            )
+                    # ----- Step 1.3: 高清回溯 -----
+                    update_task_progress(self.output_guid, 70, "正在高清回溯截取...")
+                    logger.info("📸 Step 1.3: 高清回溯 (从原视频截取)")
+                    
+                    ppt_path = self._high_res_capture(
+                        source_video=input_video_path,
+                        timestamps=final_timestamps,
+                        crop_bbox=bbox
+                    )
+                    
+                    if ppt_path:
+                        logger.success(f"✅ PPT 生成完成: {ppt_path.name}")
+                    else:
+                        logger.warning("⚠️ PPT 生成失败")
             
-            try:
-                logger.info("🔊 调用 FunASR 进行本地语音识别...")
-                transcript_text = get_audio_transcriber().transcribe_video(input_video_path)
+            # ============================================================
+            #               模块 2: 音频转录 (等待后台结果)
+            # ============================================================
+            if audio_future is not None:
+                # 进度由 PPT 模块驱动，音频无细粒度进度:
+                #   - 若同时启用 PPT: PPT 完成后停在 95% 等待转录
+                #   - 若仅音频: 停在 5% 等待转录
+                update_task_progress(
+                    self.output_guid, 
+                    95 if enable_ppt_extraction else 5, 
+                    "正在等待语音识别完成 (FunASR)..."
+                )
                 
-                if transcript_text:
-                    transcript_path = self.transcripts_dir / f"{self.output_guid}.txt"
-                    with open(transcript_path, "w", encoding="utf-8") as f:
-                        f.write(transcript_text)
-                    logger.success(f"✅ 转录文件已保存: {transcript_path.name}")
-                    logger.debug(f"   📝 转录内容预览: {transcript_text[:100]}...")
-                else:
-                    logger.warning("⚠️ 转录结果为空")
+                try:
+                    transcript_text = audio_future.result()
                     
-            except Exception as e:
-                logger.exception(f"❌ 音频转录过程出错: {e}")
+                    if transcript_text:
+                        transcript_path = self.transcripts_dir / f"{self.output_guid}.txt"
+                        with open(transcript_path, "w", encoding="utf-8") as f:
+                            f.write(transcript_text)
+                        logger.success(f"✅ 转录文件已保存: {transcript_path.name}")
+                        logger.debug(f"   📝 转录内容预览: {transcript_text[:100]}...")
+                    else:
+                        logger.warning("⚠️ 转录结果为空")
+                        
+                except Exception as e:
+                    logger.exception(f"❌ 音频转录过程出错: {e}")
+        finally:
+            # PPT 提取失败时也等待后台转录结束，避免遗留线程继续占用 GPU
+            if audio_executor is not None:
+                audio_executor.shutdown(wait=True)
         
         # ============================================================
         #               流程结束: 清理临时文件
@@ -267,11 +661,43 @@ class VideoService:
         
         return result
 
+    @staticmethod
+    def shutdown() -> None:
+        """
+        释放跨任务共享的处理器资源
+        
+        在服务进程退出时调用 (main.py 的 lifespan 中)。
+        任务之间保留 CUDA 上下文与显存缓存以加速下一个任务，
+        只有在这里才统一释放。
+        """
+        get_frame_processor.cache_clear()
+        logger.debug("🧹 共享 GPU 帧处理器已释放")
+
+    def _report_progress(self, progress: int, message: str, force: bool = False) -> None:
+        """
+        节流上报子阶段进度 (最多每 PROGRESS_MIN_INTERVAL 秒一次)
+        
+        Why 节流?
+            子阶段回调按帧触发，频率远高于前端轮询频率；
+            若任务状态改为 Redis/DB 存储，每次上报都是一次网络往返。
+            阶段切换、完成与失败等关键节点直接调用 update_task_progress，不经过节流。
+        
+        Args:
+            progress: 进度百分比 (0-100)
+            message: 当前阶段描述
+            force: 忽略节流立即上报 (如子阶段结束)
+        """
+        now = time.monotonic()
+        if not force and now - self._last_progress_t < PROGRESS_MIN_INTERVAL:
+            return
+        self._last_progress_t = now
+        update_task_progress(self.output_guid, progress, message)
+
     def _cleanup_temp_files(self) -> None:
         """
         清理临时文件
         
-        在处理流程结束后调用，删除轻量视频等临时文件。
+        在处理流程结束后调用，删除任务临时目录。
         """
         try:
             if self.temp_video_dir.exists():
@@ -285,10 +711,11 @@ class VideoService:
         定位视频中的 PPT 区域 (边缘检测法)
         
         算法策略:
-            1. 在视频 20%/40%/60% 位置各采样一帧
-            2. 使用 Canny 边缘检测识别边缘
-            3. 使用轮廓分析寻找最大四边形区域
-            4. 返回该区域的 bounding box
+            0. 按视频内容指纹查询缓存，命中则直接返回
+            1. 先在视频 40% 位置采样一帧，找到有效区域即返回
+            2. 失败时再依次读取 20%/60% 位置，读取与分析重叠，已成功则不再 seek
+            3. 使用 Canny 边缘检测 + 轮廓分析寻找最大四边形区域
+            4. 返回该区域的 bounding box 并写入缓存
         
         Why 多点采样?
             - 视频开头/结尾可能没有 PPT 画面
@@ -302,133 +729,142 @@ class VideoService:
         """
         logger.debug(f"🔍 开始定位 PPT 区域: {video_path.name}")
         
+        debug_dir = self.debug_images_dir if self.debug_enabled else None
+        
+        fingerprint = _video_fingerprint(video_path)
+        cached_bbox = _get_cached_roi(fingerprint)
+        if cached_bbox:
+            logger.info(f"   ⚡ 命中 ROI 缓存，跳过区域定位: {cached_bbox}")
+            return cached_bbox
+        
         cap = cv2.VideoCapture(str(video_path))
         if not cap.isOpened():
             logger.error(f"❌ 无法打开视频: {video_path}")
             return None
         
+        # 回退采样点的分析线程池 (首选点命中时不会提交任何任务)
+        # Why 线程池? OpenCV 的 Canny/findContours 等调用会释放 GIL，
+        # 读取下一采样点的同时分析上一采样点
+        executor = ThreadPoolExecutor(max_workers=max(1, len(ROI_SAMPLE_POINTS) - 1))
+        # 按采样顺序插入 (dict 保序)，结果也按此顺序采纳
+        futures: dict[Future, Tuple[float, float, np.ndarray]] = {}
+        
+        def prev_succeeded(future: Optional[Future]) -> bool:
+            """短暂等待上一采样点的分析，判断其是否已成功"""
+            if future is None:
+                return False
+            try:
+                return future.result(timeout=ROI_PREV_ANALYSIS_WAIT) is not None
+            except Exception:
+                # 超时或分析异常: 继续读取下一采样点 (异常在最终采纳时再抛出)
+                return False
+        
         try:
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            sample_points = [0.2, 0.4, 0.6]  # 采样点: 20%, 40%, 60%
-            
-            logger.debug(f"   📊 总帧数: {total_frames}, 采样点: {sample_points}")
-            
-            for point in sample_points:
-                frame_idx = int(total_frames * point)
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = cap.read()
-                
-                if not ret:
-                    logger.warning(f"   ⚠️ 采样点 {point:.0%} 读取失败")
-                    continue
-                
-                logger.debug(f"   🖼️ 分析采样点 {point:.0%} (帧 {frame_idx})")
-                
-                # 保存调试图像 (可视化边缘检测过程)
-                cv2.imwrite(str(self.debug_images_dir / "0_original.jpg"), frame)
+            try:
+                fps = cap.get(cv2.CAP_PROP_FPS)
+                total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                duration = total_frames / fps if fps > 0 else 0
                 
-                # ----- Canny 边缘检测流水线 -----
-                # Step 1: BGR -> Gray (减少计算量)
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                cv2.imwrite(str(self.debug_images_dir / "1_gray.jpg"), gray)
+                logger.debug(f"   📊 总时长: {duration:.1f}s, 采样点: {list(ROI_SAMPLE_POINTS)}")
                 
-                # Step 2: 高斯模糊 (去噪，平滑边缘)
-                blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+                def read_sample(point: float) -> Optional[Tuple[float, float, np.ndarray]]:
+                    """按时长比例 seek 并读取一帧"""
+                    # Note: OpenCV FFmpeg 后端会把毫秒换算为帧号，与 CAP_PROP_POS_FRAMES
+                    #   走同一 seek 逻辑 (从前一关键帧向前解码)；按毫秒设置只是便于日志输出时间戳
+                    sample_ts = duration * point
+                    cap.set(cv2.CAP_PROP_POS_MSEC, sample_ts * 1000)
+                    ret, frame = cap.read()
+                    
+                    if not ret:
+                        logger.warning(f"   ⚠️ 采样点 {point:.0%} 读取失败")
+                        return None
+                    return point, sample_ts, frame
                 
-                # Step 3: Canny 边缘检测
-                # Why (30, 120)? 低阈值 30 检测弱边缘，高阈值 120 过滤噪点
-                edged = cv2.Canny(blurred, 30, 120)
-                cv2.imwrite(str(self.debug_images_dir / "2_edged.jpg"), edged)
+                # ----- 首选采样点: 命中即返回，无需 seek 其余位置 -----
+                first_point, *fallback_points = ROI_SAMPLE_POINTS
+                sample = read_sample(first_point)
+                if sample is not None:
+                    result = _analyze_frame(sample[2], 0, debug_dir)
+                    if result is not None:
+                        return self._accept_ppt_region(fingerprint, sample, result)
+                    logger.debug(f"   ⚠️ 采样点 {first_point:.0%} (@ {sample[1]:.2f}s) 未找到有效四边形")
                 
-                # ----- 轮廓分析 -----
-                contours, _ = cv2.findContours(
-                    edged.copy(), 
-                    cv2.RETR_EXTERNAL,      # 只检测外轮廓
-                    cv2.CHAIN_APPROX_SIMPLE  # 压缩轮廓点
-                )
+                # ----- 回退采样点: 升序读取 (顺序前向 seek 开销最小)，边读边分析 -----
+                # 上一采样点在短暂等待内分析成功时，跳过剩余 seek 与解码
+                # (它比后续采样点更早，按顺序采纳时本就会胜出)
+                prev_future: Optional[Future] = None
+                for i, point in enumerate(sorted(fallback_points), start=1):
+                    if prev_succeeded(prev_future):
+                        break
+                    sample = read_sample(point)
+                    if sample is not None:
+                        prev_future = executor.submit(_analyze_frame, sample[2], i, debug_dir)
+                        futures[prev_future] = sample
+            finally:
+                cap.release()
+            
+            # 按采样顺序采纳: 最早成功的采样点胜出，结果 (及写入的缓存) 可复现
+            for future, sample in futures.items():
+                result = future.result()
                 
-                if not contours:
-                    logger.debug(f"   ⚠️ 采样点 {point:.0%} 未找到轮廓")
+                if result is None:
+                    logger.debug(f"   ⚠️ 采样点 {sample[0]:.0%} (@ {sample[1]:.2f}s) 未找到有效四边形")
                     continue
                 
-                # 取面积最大的 5 个轮廓 (PPT 通常是最大的矩形区域)
-                contours = sorted(contours, key=cv2.contourArea, reverse=True)[:5]
-                
-                for c in contours:
-                    # 轮廓近似: 减少顶点数量
-                    peri = cv2.arcLength(c, True)
-                    approx = cv2.approxPolyDP(c, 0.03 * peri, True)
-                    
-                    # 筛选条件:
-                    #   1. 必须是 4 边形 (PPT 是矩形)
-                    #   2. 面积占比 > 10% (过滤小区域)
-                    frame_area = frame.shape[0] * frame.shape[1]
-                    area_ratio = cv2.contourArea(c) / frame_area
-                    
-                    if len(approx) == 4 and area_ratio > 0.1:
-                        # 保存调试结果
-                        debug_img = frame.copy()
-                        cv2.drawContours(debug_img, [approx], -1, (0, 255, 0), 3)
-                        cv2.imwrite(str(self.debug_images_dir / "3_final_region.jpg"), debug_img)
-                        
-                        bbox = cv2.boundingRect(approx)
-                        logger.info(f"   ✅ 在采样点 {point:.0%} 找到 PPT 区域")
-                        logger.info(f"      📐 Bounding Box: x={bbox[0]}, y={bbox[1]}, w={bbox[2]}, h={bbox[3]}")
-                        logger.info(f"      📊 面积占比: {area_ratio:.1%}")
-                        return bbox
-            
-            logger.error("❌ 所有采样点均未找到有效 PPT 区域")
-            return None
-            
+                return self._accept_ppt_region(fingerprint, sample, result)
         finally:
-            cap.release()
+            # 取消尚未开始的分析任务
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        logger.error("❌ 所有采样点均未找到有效 PPT 区域")
+        return None
 
-    def _generate_lightweight_video(
-        self, 
-        source_video: Path, 
-        crop_bbox: Tuple[int, int, int, int]
-    ) -> Optional[Path]:
+    def _accept_ppt_region(
+        self,
+        fingerprint: str,
+        sample: Tuple[float, float, np.ndarray],
+        result: Tuple[Tuple[int, int, int, int], np.ndarray, float]
+    ) -> Tuple[int, int, int, int]:
         """
-        生成轻量视频 (核心优化)
-        
-        调用 FFmpeg 生成低分辨率轻量视频用于后续分析。
-        
-        轻量视频参数:
-            - crop: 只保留 PPT 区域
-            - scale: 宽缩放到 640px
-            - fps: 降帧到 5 FPS
-            - audio: 去除音频
+        采纳某采样点的定位结果: 保存调试图、写入缓存并输出日志
         
         Args:
-            source_video: 原始视频路径
-            crop_bbox: 裁剪区域 (x, y, w, h)
+            fingerprint: 视频内容指纹
+            sample: (采样比例, 时间戳, 原始帧)
+            result: _analyze_frame() 的返回值 (bbox, approx, area_ratio)
         
         Returns:
-            Path: 轻量视频路径，失败返回 None
+            tuple: (x, y, w, h) PPT 区域
         """
-        lightweight_path = self.temp_video_dir / f"{self.output_guid}_lightweight.mp4"
+        point, _, frame = sample
+        bbox, approx, area_ratio = result
         
-        def progress_callback(percent: int, message: str) -> None:
-            """轻量视频生成进度回调 (占 10-25%)"""
-            actual_progress = 10 + int(percent * 0.15)
-            update_task_progress(self.output_guid, actual_progress, message)
+        # 保存调试结果 (面向用户查看，保留 JPEG)
+        if self.debug_enabled:
+            debug_img = frame.copy()
+            cv2.drawContours(debug_img, [approx], -1, (0, 255, 0), 3)
+            cv2.imwrite(str(self.debug_images_dir / "3_final_region.jpg"), debug_img)
         
-        result = generate_lightweight_video(
-            source_video=source_video,
-            output_path=lightweight_path,
-            crop_box=crop_bbox,
-            target_width=640,
-            target_fps=5,
-            progress_callback=progress_callback
-        )
+        try:
+            _save_cached_roi(fingerprint, bbox)
+        except OSError as e:
+            logger.warning(f"⚠️ ROI 缓存写入失败: {e}")
         
-        return result
+        logger.info(f"   ✅ 在采样点 {point:.0%} 找到 PPT 区域")
+        logger.info(f"      📐 Bounding Box: x={bbox[0]}, y={bbox[1]}, w={bbox[2]}, h={bbox[3]}")
+        logger.info(f"      📊 面积占比: {area_ratio:.1%}")
+        return bbox
 
-    def _run_funnel_analysis(self, lightweight_video: Path) -> list[float]:
+    def _run_funnel_analysis(
+        self, 
+        source_video: Path, 
+        crop_bbox: Tuple[int, int, int, int]
+    ) -> list[float]:
         """
-        三层漏斗分析 (运行在轻量视频上)
+        三层漏斗分析 (运行在轻量帧流上)
         
-        在轻量视频上执行 L1+L2+L3 分析，输出最终时间戳列表。
+        FFmpeg 将原视频裁剪缩放为轻量帧 (640px, 5fps) 并经 rawvideo 管道输出，
+        边解码边执行 L1+L2+L3 分析，输出最终时间戳列表。
         
         处理流程:
             L1 (物理层): GPU 帧差检测 → 场景分割
@@ -437,11 +873,14 @@ class VideoService:
         
         关键设计:
             - 所有逻辑基于时间戳 (秒 float)
-            - 使用轻量视频进行 OCR (快速)
+            - 轻量帧不落盘，省去编码 + 二次解码
+            - 使用轻量帧进行 OCR (快速)
             - 无文字内容的帧视为非 PPT 页面，自动过滤
+            - 三级流水线: 解码预读线程 → L1+L2 (主线程) → L3 OCR 线程，有界队列背压
         
         Args:
-            lightweight_video: 轻量视频路径 (640px, 5fps)
+            source_video: 原始视频路径
+            crop_bbox: PPT 区域 (x, y, w, h)
         
         Returns:
             list[float]: 最终时间戳列表，如 [1.2, 15.6, 48.2, ...]
@@ -453,64 +892,106 @@ class VideoService:
         
         # 重置 OCR 去重器
         self.ocr_deduper.reset()
+        self._last_saved_hash = None
         
-        final_timestamps: list[float] = []
         candidate_count = 0
         
         # ----- L1 + L2: GPU 帧差 + 清晰度择优 -----
         def l1l2_progress(percent: int, message: str) -> None:
-            """L1+L2 进度回调 (占 25-50%)"""
-            actual_progress = 25 + int(percent * 0.25)
-            update_task_progress(self.output_guid, actual_progress, message)
+            """L1+L2 进度回调 (占 10-50%)"""
+            actual_progress = 10 + int(percent * 0.40)
+            self._report_progress(actual_progress, message, force=percent >= 100)
         
-        for best_shot in self.frame_processor.extract_best_shots(
-            lightweight_video, 
+        frames = stream_lightweight_frames(
+            source_video=source_video,
+            crop_box=crop_bbox,
+            target_width=640,
+            target_fps=5,
             progress_callback=l1l2_progress
-        ):
-            candidate_count += 1
-            
-            logger.debug(f"   🎬 候选帧 #{candidate_count}: "
-                        f"timestamp={best_shot.timestamp:.2f}s, "
-                        f"清晰度={best_shot.sharpness_score:.4f}")
-            
-            # ----- L3: OCR 识别与过滤 -----
-            update_task_progress(
-                self.output_guid, 
-                50 + int((candidate_count / max(candidate_count, 1)) * 20),
-                f"L3 OCR 分析: 第 {candidate_count} 个候选"
-            )
-            
-            # 从轻量视频读取帧进行 OCR (轻量视频足够进行文字识别)
-            frame = self.frame_processor.get_frame_at_timestamp(
-                lightweight_video, 
-                best_shot.timestamp
-            )
-            
-            if frame is None:
-                logger.warning(f"   ⚠️ 无法读取帧 @ {best_shot.timestamp:.2f}s")
-                continue
-            
-            is_duplicate, text = self.ocr_deduper.is_duplicate(frame)
-            
-            # 过滤条件 1: 无文字内容 → 非 PPT 页面
-            if not text or not text.strip():
-                logger.debug(f"   📄 @ {best_shot.timestamp:.2f}s 无文字内容，判定为非PPT页面，跳过")
-                continue
-            
-            # 过滤条件 2: 与已保存页面重复
-            if is_duplicate:
-                logger.debug(f"   🔄 @ {best_shot.timestamp:.2f}s 与已保存页相似度过高，跳过")
-                continue
-            
-            # 保留该时间戳
-            final_timestamps.append(best_shot.timestamp)
-            self.ocr_deduper.mark_as_saved(text)
+        )
+        # 解码线程预读轻量帧，使 FFmpeg 解码与 GPU 帧差重叠
+        frames = _prefetch(frames, maxsize=FRAME_PREFETCH_SIZE)
+        
+        # ----- L3: 单线程 OCR 流水线 -----
+        # Why 单 worker?
+        #   - L3 与 L1+L2 (FFmpeg 解码 + GPU 帧差) 重叠执行，OCR 不再阻塞解码
+        #   - PaddleOCR 单例非线程安全，且去重状态需按时间顺序单写
+        #   - 单 worker 天然保证候选按提交顺序处理，结果确定
+        pending: deque = deque()
+        results: list[Optional[float]] = []
+        
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="l3-ocr") as executor:
+            for best_shot in self.frame_processor.extract_best_shots_from_frames(frames):
+                candidate_count += 1
+                
+                logger.debug(f"   🎬 候选帧 #{candidate_count}: "
+                            f"timestamp={best_shot.timestamp:.2f}s, "
+                            f"清晰度={best_shot.sharpness_score:.4f}")
+                
+                pending.append(executor.submit(self._run_l3_filter, best_shot))
+                
+                # 背压: L3 落后过多时等待最早的候选完成
+                while len(pending) > L3_MAX_PENDING:
+                    results.append(pending.popleft().result())
             
-            logger.info(f"   ✅ 保留: @ {best_shot.timestamp:.2f}s (第 {len(final_timestamps)} 页)")
+            update_task_progress(self.output_guid, 50, f"L3 OCR 分析: 剩余 {len(pending)} 个候选")
+            while pending:
+                results.append(pending.popleft().result())
+        
+        final_timestamps = [ts for ts in results if ts is not None]
         
         logger.success(f"✅ 漏斗分析完成: {candidate_count} 候选 → {len(final_timestamps)} 保留")
         return final_timestamps
 
+    def _run_l3_filter(self, best_shot: BestShot) -> Optional[float]:
+        """
+        L3 语义层: 对单个冠军帧执行 dHash 预筛 + OCR 去重
+        
+        仅在 L3 单线程 worker 中按候选顺序调用，
+        _last_saved_hash 与 ocr_deduper 的状态只在此处写入。
+        
+        Args:
+            best_shot: L1+L2 输出的冠军帧
+        
+        Returns:
+            float: 保留页面的时间戳，被过滤返回 None
+        """
+        # 直接使用 L1+L2 阶段解码好的冠军帧 (轻量帧足够进行文字识别)
+        frame = best_shot.frame
+        
+        if frame is None:
+            logger.warning(f"   ⚠️ 无法读取帧 @ {best_shot.timestamp:.2f}s")
+            return None
+        
+        # ----- L3 前置过滤: dHash 视觉比对 -----
+        # Why? OCR 是流水线瓶颈，视觉几乎相同的帧无需再识别文字
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        frame_hash = _dhash64(cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA))
+        
+        if self._last_saved_hash is not None and \
+                (frame_hash ^ self._last_saved_hash).bit_count() <= DHASH_DUPLICATE_DISTANCE:
+            logger.debug(f"   🔄 @ {best_shot.timestamp:.2f}s 与上一保存页 dHash 相近，跳过 OCR")
+            return None
+        
+        is_duplicate, text = self.ocr_deduper.is_duplicate(frame)
+        
+        # 过滤条件 1: 无文字内容 → 非 PPT 页面
+        if not text or not text.strip():
+            logger.debug(f"   📄 @ {best_shot.timestamp:.2f}s 无文字内容，判定为非PPT页面，跳过")
+            return None
+        
+        # 过滤条件 2: 与已保存页面重复
+        if is_duplicate:
+            logger.debug(f"   🔄 @ {best_shot.timestamp:.2f}s 与已保存页相似度过高，跳过")
+            return None
+        
+        # 保留该时间戳
+        # (is_duplicate 判定为新页面时已调用 mark_as_saved 更新文本状态，此处不再重复)
+        self._last_saved_hash = frame_hash
+        
+        logger.info(f"   ✅ 保留: @ {best_shot.timestamp:.2f}s")
+        return best_shot.timestamp
+
     def _high_res_capture(
         self, 
         source_video: Path,
@@ -546,7 +1027,7 @@ class VideoService:
         def capture_progress(percent: int, message: str) -> None:
             """截取进度回调 (占 70-90%)"""
             actual_progress = 70 + int(percent * 0.2)
-            update_task_progress(self.output_guid, actual_progress, message)
+            self._report_progress(actual_progress, message, force=percent >= 100)
         
         frame_paths = extract_frames_batch(
             source_video=source_video,
@@ -564,27 +1045,14 @@ class VideoService:
         update_task_progress(self.output_guid, 92, "正在生成 PPTX...")
         logger.info(f"📄 组装 PPTX: {len(frame_paths)} 页")
         
-        ppt_path = self.ppt_output_dir / f"{self.output_guid}.pptx"
-        prs = Presentation()
-        prs.slide_width = Inches(16)
-        prs.slide_height = Inches(9)
-        
-        for i, img_path in enumerate(frame_paths):
-            # 添加空白幻灯片
-            slide = prs.slides.add_slide(prs.slide_layouts[6])
-            
-            # 添加图片 (全屏)
-            slide.shapes.add_picture(
-                str(img_path),
-                Inches(0), 
-                Inches(0),
-                width=prs.slide_width,
-                height=prs.slide_height
-            )
-            
-            logger.debug(f"   📄 添加第 {i+1} 页: {img_path.name}")
-        
-        prs.save(str(ppt_path))
+        # Why 不逐页 add_slide/add_picture? python-pptx 保存时需序列化整棵 XML DOM，
+        #   直接写 zip 条目在页数较多时快数倍且内存占用更低
+        ppt_path = build_image_pptx(
+            image_paths=frame_paths,
+            output_path=self.ppt_output_dir / f"{self.output_guid}.pptx",
+            width_emu=Inches(16),
+            height_emu=Inches(9)
+        )
         logger.success(f"✅ PPTX 生成完成: {ppt_path.name} ({len(frame_paths)} 页)")
         
         return ppt_path
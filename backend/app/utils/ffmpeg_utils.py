@@ -2,265 +2,277 @@
 文件名: ffmpeg_utils.py
 功能描述: FFmpeg 封装模块，提供健壮的视频处理工具函数
 核心逻辑:
-    - generate_lightweight_video(): 生成低分辨率轻量视频 (640px, 5fps)
+    - stream_lightweight_frames(): 以原始帧管道流式输出轻量帧 (640px, 5fps)，不落盘、不二次解码
     - extract_frame_at_timestamp(): 从原视频精确截取指定时间点画面
-    - GPU (h264_nvenc) → CPU (libx264) 自动回退机制
+    - extract_frames_batch(): 单次 FFmpeg 调用 (select 滤镜) 批量截取多个时间点
+    - 轻量帧流优先 NVDEC (-hwaccel cuda) 硬解，失败自动回退 CPU 软解
 
 设计亮点:
     - 所有函数基于时间戳 (seconds float)，严禁依赖 frame_index
     - 完整的 try-except 和 fallback 机制
     - 实时进度解析支持
 """
+import functools
+import os
 import re
 import subprocess
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Callable, Optional, Tuple
+from typing import Callable, Generator, Optional, Tuple
 
+import numpy as np
 from loguru import logger
 
 
 # ============================================================
-#              FFmpeg 编码器检测
+#              FFmpeg 硬件解码检测
 # ============================================================
 
-def _check_nvenc_available() -> bool:
+@functools.lru_cache(maxsize=1)
+def _check_cuda_hwaccel_available() -> bool:
     """
-    检测系统是否支持 NVENC 硬件编码
+    检测 FFmpeg 是否支持 CUDA (NVDEC) 硬件解码
     
-    通过运行 `ffmpeg -encoders` 并解析输出来判断。
+    通过运行 `ffmpeg -hwaccels` 并解析输出来判断，结果进程内缓存。
     
     Returns:
-        bool: True 表示 h264_nvenc 可用
+        bool: True 表示 -hwaccel cuda 可用
     """
     try:
         result = subprocess.run(
-            ["ffmpeg", "-encoders"],
+            ["ffmpeg", "-hide_banner", "-hwaccels"],
             capture_output=True,
             text=True,
             timeout=10
         )
-        return "h264_nvenc" in result.stdout
+        return "cuda" in result.stdout.split()
     except (FileNotFoundError, subprocess.TimeoutExpired):
         return False
 
 
+# 轻量帧流 crop/scale/fps 滤镜的线程数
+# 显式指定，避免容器 (cgroup 限核) 下 FFmpeg 自动探测偏小
+FILTER_THREADS = min(os.cpu_count() or 4, 16)
+
+
+# ============================================================
+#              FFmpeg 进度解析
+# ============================================================
+# 截取进度 (格式: frame=   12)
+_FRAME_PATTERN = re.compile(r'frame=\s*(\d+)')
+# stderr 进度回调的最小间隔 (秒)
+# Why 先判断间隔再做正则?
+#   FFmpeg 每秒输出数十上百行 stderr，间隔内的行直接跳过，
+#   正则匹配与数值换算只以约 1Hz 的频率执行
+STDERR_PROGRESS_INTERVAL = 1.0
+
+
+# ============================================================
+#              裁剪区域对齐
+# ============================================================
+
+def _align_even(crop_box: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """
+    将裁剪区域各分量向下对齐到偶数
+
+    Why 偶数?
+        yuv420p 色度平面为亮度的 1/2，crop 的位置与尺寸
+        为奇数时会被 FFmpeg 截断或产生色度错位。
+
+    Args:
+        crop_box: 裁剪区域 (x, y, w, h)
+
+    Returns:
+        Tuple[int, int, int, int]: 对齐后的 (x, y, w, h)，宽高至少为 2
+    """
+    x, y, w, h = (int(v) & ~1 for v in crop_box)
+    return x, y, max(2, w), max(2, h)
+
+
 # ============================================================
-#              轻量视频生成
+#              轻量帧流
 # ============================================================
 
-def generate_lightweight_video(
+def stream_lightweight_frames(
     source_video: Path,
-    output_path: Path,
     crop_box: Tuple[int, int, int, int],
     target_width: int = 640,
     target_fps: int = 5,
-    progress_callback: Optional[Callable[[int, str], None]] = None
-) -> Optional[Path]:
+    progress_callback: Optional[Callable[[int, str], None]] = None,
+    use_gpu_decode: bool = True
+) -> Generator[Tuple[float, int, np.ndarray], None, None]:
     """
-    生成轻量视频 (Lightweight Media) - 核心优化函数
+    流式生成轻量帧 (裁剪 + 缩放 + 降帧后的原始 BGR 帧)
     
-    对原视频进行裁剪、缩放、降帧处理，生成用于后续分析的轻量级视频。
-    极大提升 L1/L2/L3 漏斗模型的处理速度。
+    滤镜链 crop → scale → fps，输出 rawvideo 到 stdout 管道，由调用方直接消费。
     
-    FFmpeg 滤镜链:
-        crop={w}:{h}:{x}:{y} → scale={width}:-1 → fps={fps}
+    Why 管道而非轻量视频文件?
+        生成轻量视频需要: 解码原视频 → 编码轻量视频 → 写盘 → 再解码。
+        管道模式只解码原视频一次，省去编码、磁盘往返和二次解码。
     
     Args:
         source_video: 原始视频路径
-        output_path: 轻量视频输出路径
         crop_box: 裁剪区域 (x, y, w, h)
-            - 来自 ROI 检测的 PPT 区域
-        target_width: 缩放目标宽度 (高度自适应)
-            - 默认 640px，足够进行内容分析
+        target_width: 缩放目标宽度 (高度按比例，对齐偶数)
         target_fps: 目标帧率
-            - 默认 5 FPS，足够检测 PPT 翻页
         progress_callback: 进度回调函数
             - 签名: callback(percent: int, message: str)
+        use_gpu_decode: 是否优先使用 NVDEC 硬解 (不可用时自动跳过)
     
-    Returns:
-        Path: 生成的轻量视频路径，失败返回 None
+    Yields:
+        Tuple[float, int, np.ndarray]: (时间戳秒, 帧序号, BGR 帧)
+            - 时间戳 = 帧序号 / target_fps
     
-    Note:
-        自动尝试 GPU 编码 (h264_nvenc)，失败则回退到 CPU (libx264)
+    Raises:
+        RuntimeError: FFmpeg 异常退出
     """
     source_video = Path(source_video)
-    output_path = Path(output_path)
     
-    # 确保输出目录存在
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # ========== 偶数对齐 ==========
+    x, y, w, h = _align_even(crop_box)
     
-    x, y, w, h = crop_box
-    
-    # ========== NVENC 兼容性修正 ==========
-    # h264_nvenc 要求宽高为偶数，scale 滤镜自动处理高度
-    # 但 crop 的 x, y, w, h 必须手动对齐
-    original_box = (x, y, w, h)
-    x = (x // 2) * 2
-    y = (y // 2) * 2
-    w = (w // 2) * 2
-    h = (h // 2) * 2
-    
-    if (x, y, w, h) != original_box:
-        logger.debug(f"📐 crop_box 对齐偶数: {original_box} → ({x}, {y}, {w}, {h})")
-    
-    # ========== 构建滤镜链 ==========
-    # Why scale=-2 而非 -1?
-    #   -2 确保输出高度也是偶数，避免某些编码器报错
-    vf_filter = f"crop={w}:{h}:{x}:{y},scale={target_width}:-2,fps={target_fps}"
-    
-    # 首先尝试 GPU 编码
-    success = _run_ffmpeg_encode(
-        source_video=source_video,
-        output_path=output_path,
-        vf_filter=vf_filter,
-        use_gpu=True,
-        progress_callback=progress_callback
-    )
-    
-    if success:
-        return output_path
-    
-    # GPU 失败，回退到 CPU
-    logger.warning("⚠️ GPU 编码失败，尝试 CPU 回退...")
-    if progress_callback:
-        progress_callback(0, "GPU 编码失败，切换 CPU 模式...")
+    # 显式计算输出尺寸，以便按固定字节数切分原始帧
+    out_w = target_width
+    out_h = max(2, int(round(h * target_width / w / 2)) * 2)
+    
+    vf_filter = f"crop={w}:{h}:{x}:{y},scale={out_w}:{out_h},fps={target_fps}"
     
-    success = _run_ffmpeg_encode(
-        source_video=source_video,
-        output_path=output_path,
-        vf_filter=vf_filter,
-        use_gpu=False,
-        progress_callback=progress_callback
-    )
+    logger.info(f"🎬 开始流式生成轻量帧 ({out_w}x{out_h}, {target_fps}fps)")
+    logger.info(f"   🔧 滤镜: {vf_filter}")
     
-    if success:
-        return output_path
+    total_duration = _get_video_duration(source_video)
+    start_time = time.time()
     
-    logger.error("❌ 轻量视频生成失败 (GPU/CPU 均失败)")
-    return None
+    # 首先尝试 NVDEC 硬解，失败 (且尚未产出任何帧) 则回退 CPU 软解
+    decode_modes = [True, False] if use_gpu_decode and _check_cuda_hwaccel_available() else [False]
+    
+    frame_count = 0
+    for use_gpu in decode_modes:
+        try:
+            for item in _iter_rawvideo_frames(
+                source_video=source_video,
+                vf_filter=vf_filter,
+                frame_shape=(out_h, out_w, 3),
+                target_fps=target_fps,
+                total_duration=total_duration,
+                use_gpu=use_gpu,
+                progress_callback=progress_callback
+            ):
+                frame_count += 1
+                yield item
+            break
+        except RuntimeError:
+            if not use_gpu or frame_count > 0:
+                raise
+            logger.warning("⚠️ NVDEC 硬解失败，尝试 CPU 软解回退...")
+    
+    elapsed = time.time() - start_time
+    logger.success(f"✅ 轻量帧流结束: 共 {frame_count} 帧，耗时: {elapsed:.1f}s")
+    if progress_callback:
+        progress_callback(100, "L1+L2 分析完成")
 
 
-def _run_ffmpeg_encode(
+def _iter_rawvideo_frames(
     source_video: Path,
-    output_path: Path,
     vf_filter: str,
+    frame_shape: Tuple[int, int, int],
+    target_fps: int,
+    total_duration: float,
     use_gpu: bool = True,
     progress_callback: Optional[Callable[[int, str], None]] = None
-) -> bool:
+) -> Generator[Tuple[float, int, np.ndarray], None, None]:
     """
-    执行 FFmpeg 编码命令
+    执行 FFmpeg rawvideo 管道并按固定字节数切分帧
     
-    内部函数，封装 GPU/CPU 两种编码模式的命令构建和执行。
+    内部函数，封装 NVDEC/CPU 两种解码模式的命令构建和执行。
+    
+    Why 不指定 -hwaccel_output_format cuda?
+        crop/scale/fps 为 CPU 滤镜，解码帧需下载回内存；
+        NVDEC 仍然承担了最重的 H.264/HEVC 解码工作。
     
     Args:
         source_video: 输入视频
-        output_path: 输出路径
         vf_filter: 视频滤镜链 (crop → scale → fps)
-        use_gpu: 是否使用 GPU 编码
+        frame_shape: 输出帧形状 (h, w, 3)
+        target_fps: 目标帧率 (用于换算时间戳)
+        total_duration: 视频总时长 (用于进度计算)
+        use_gpu: 是否使用 NVDEC 硬解
         progress_callback: 进度回调
     
-    Returns:
-        bool: 编码是否成功
-    """
-    mode_str = "GPU (h264_nvenc)" if use_gpu else "CPU (libx264)"
-    logger.info(f"🎬 开始生成轻量视频 [{mode_str}]")
-    logger.info(f"   📂 输入: {source_video.name}")
-    logger.info(f"   📂 输出: {output_path.name}")
-    logger.info(f"   🔧 滤镜: {vf_filter}")
+    Yields:
+        Tuple[float, int, np.ndarray]: (时间戳秒, 帧序号, BGR 帧)
     
-    # ========== 构建命令 ==========
-    cmd = [
-        "ffmpeg",
-        "-y",  # 覆盖已存在文件
-        "-i", str(source_video),
-        "-vf", vf_filter,
-    ]
+    Raises:
+        RuntimeError: FFmpeg 异常退出
+    """
+    mode_str = "GPU (NVDEC)" if use_gpu else "CPU"
     
+    cmd = ["ffmpeg", "-v", "error"]
     if use_gpu:
-        cmd.extend([
-            "-c:v", "h264_nvenc",
-            "-preset", "p1",  # NVENC 最快预设
-            "-cq", "28",      # 质量控制 (轻量视频可容忍更高压缩)
-        ])
-    else:
-        cmd.extend([
-            "-c:v", "libx264",
-            "-preset", "ultrafast",  # CPU 最快预设
-            "-crf", "28",
-        ])
-    
+        cmd.extend(["-hwaccel", "cuda"])
+    # crop/scale/fps 在 CPU 上执行 (NVDEC 模式下同样如此)
+    cmd.extend(["-filter_threads", str(FILTER_THREADS)])
     cmd.extend([
-        "-pix_fmt", "yuv420p",
-        "-an",  # 去除音频
-        str(output_path)
+        "-i", str(source_video),
+        "-vf", vf_filter,
+        "-an",
+        "-f", "rawvideo",
+        "-pix_fmt", "bgr24",
+        "pipe:1"
     ])
     
+    logger.info(f"   ⚙️ 解码模式: {mode_str}")
     logger.debug(f"   命令: {' '.join(cmd)}")
     
-    start_time = time.time()
-    
-    try:
-        # ========== 异步执行并解析进度 ==========
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8',
-            errors='replace'
-        )
-        
-        # FFmpeg 进度解析正则
-        # 格式: time=00:01:23.45
-        time_pattern = re.compile(r'time=(\d+):(\d+):(\d+\.\d+)')
+    out_h, out_w, _ = frame_shape
+    frame_bytes = out_h * out_w * 3
+    
+    # stderr 写入临时文件，避免管道写满导致 FFmpeg 阻塞
+    with tempfile.TemporaryFile() as stderr_file:
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file
+            )
+        except FileNotFoundError:
+            logger.error("❌ FFmpeg 未安装或不在 PATH 中")
+            raise RuntimeError("FFmpeg 未安装或不在 PATH 中")
         
-        # 获取视频总时长 (用于计算进度百分比)
-        total_duration = _get_video_duration(source_video)
-        
-        stderr_lines = []
-        last_progress_time = time.time()
-        
-        for line in process.stderr:
-            stderr_lines.append(line)
-            
-            # 解析时间进度
-            match = time_pattern.search(line)
-            if match and total_duration > 0:
-                hours = int(match.group(1))
-                minutes = int(match.group(2))
-                seconds = float(match.group(3))
-                current_time = hours * 3600 + minutes * 60 + seconds
+        frame_idx = 0
+        finished = False
+        try:
+            while True:
+                buf = bytearray(frame_bytes)
+                if process.stdout.readinto(buf) < frame_bytes:
+                    break
                 
-                percent = min(99, int((current_time / total_duration) * 100))
+                current_ts = frame_idx / target_fps
+                yield current_ts, frame_idx, np.frombuffer(buf, dtype=np.uint8).reshape(frame_shape)
+                frame_idx += 1
                 
-                # 限制回调频率 (每 1 秒最多一次)
-                now = time.time()
-                if progress_callback and now - last_progress_time >= 1.0:
-                    progress_callback(percent, f"生成轻量视频: {percent}%")
-                    last_progress_time = now
-        
-        process.wait()
-        elapsed = time.time() - start_time
+                # 进度回调 (每 10 帧更新一次)
+                if progress_callback and frame_idx % 10 == 0 and total_duration > 0:
+                    percent = min(99, int((current_ts / total_duration) * 100))
+                    progress_callback(percent, f"L1+L2 分析: {current_ts:.1f}s / {total_duration:.1f}s")
+            
+            process.wait()
+            finished = True
+        finally:
+            if not finished:
+                # 调用方提前结束迭代 (或抛出异常)，终止 FFmpeg
+                process.kill()
+                process.wait()
+            process.stdout.close()
         
-        if process.returncode == 0:
-            logger.success(f"✅ 轻量视频生成完成 [{mode_str}] 耗时: {elapsed:.1f}s")
-            if progress_callback:
-                progress_callback(100, "轻量视频生成完成")
-            return True
-        else:
-            stderr_text = ''.join(stderr_lines)
-            stderr_tail = stderr_text[-500:] if len(stderr_text) > 500 else stderr_text
-            logger.error(f"❌ FFmpeg 失败 [{mode_str}] returncode={process.returncode}")
+        if process.returncode != 0:
+            stderr_file.seek(0)
+            stderr_tail = stderr_file.read().decode('utf-8', errors='replace')[-500:]
+            logger.error(f"❌ FFmpeg 轻量帧流失败 [{mode_str}] returncode={process.returncode}")
             logger.debug(f"   stderr: {stderr_tail}")
-            return False
-            
-    except FileNotFoundError:
-        logger.error("❌ FFmpeg 未安装或不在 PATH 中")
-        return False
-    except Exception as e:
-        logger.exception(f"❌ FFmpeg 执行异常: {e}")
-        return False
+            raise RuntimeError(f"轻量帧流生成失败 (FFmpeg returncode={process.returncode})")
 
 
 def _get_video_duration(video_path: Path) -> float:
@@ -298,6 +310,25 @@ def _get_video_duration(video_path: Path) -> float:
 #              高清帧截取
 # ============================================================
 
+def _image_encode_args(output_path: Path) -> list[str]:
+    """
+    按输出图片格式返回 FFmpeg 编码参数
+    
+    Why 区分格式?
+        - JPEG: -q:v 2 (高质量)，体积约为 PNG 的 1/10，PPTX 组装直接嵌入
+        - PNG: 默认 compression_level=6 极耗 CPU，降到 1 以体积换速度
+    
+    Args:
+        output_path: 输出图片路径 (可为 %04d 序列模板)
+    
+    Returns:
+        list[str]: FFmpeg 输出编码参数
+    """
+    if Path(output_path).suffix.lower() == ".png":
+        return ["-compression_level", "1"]
+    return ["-q:v", "2"]
+
+
 def extract_frame_at_timestamp(
     source_video: Path,
     timestamp: float,
@@ -345,19 +376,12 @@ def extract_frame_at_timestamp(
     
     # 添加裁剪滤镜 (如果提供了 crop_box)
     if crop_box:
-        x, y, w, h = crop_box
-        # 对齐偶数
-        x = (x // 2) * 2
-        y = (y // 2) * 2
-        w = (w // 2) * 2
-        h = (h // 2) * 2
+        x, y, w, h = _align_even(crop_box)
         cmd.extend(["-vf", f"crop={w}:{h}:{x}:{y}"])
     
-    cmd.extend([
-        "-frames:v", "1",  # 只截取 1 帧
-        "-q:v", "2",       # JPEG 质量 (1-31, 2 为高质量)
-        str(output_path)
-    ])
+    cmd.extend(["-frames:v", "1"])  # 只截取 1 帧
+    cmd.extend(_image_encode_args(output_path))
+    cmd.append(str(output_path))
     
     logger.debug(f"📸 截取帧 @ {timestamp:.2f}s → {output_path.name}")
     
@@ -390,6 +414,11 @@ def extract_frame_at_timestamp(
 #              批量高清帧截取
 # ============================================================
 
+# 逐帧回退路径: 不超过该数量时串行执行
+PER_TIMESTAMP_SERIAL_MAX = 2
+# 逐帧回退路径: 并发 FFmpeg 进程数上限
+PER_TIMESTAMP_MAX_WORKERS = 8
+
 def extract_frames_batch(
     source_video: Path,
     timestamps: list[float],
@@ -400,7 +429,12 @@ def extract_frames_batch(
     """
     批量截取多个时间点的高清帧
     
-    遍历时间戳列表，逐个调用 extract_frame_at_timestamp。
+    优先使用单次 FFmpeg 调用 (select 滤镜) 一次解码截取全部时间点，
+    失败时回退为逐个调用 extract_frame_at_timestamp。
+    
+    Why 单次调用?
+        逐帧截取每个时间点都要启动一次 FFmpeg 进程并重新解封装，
+        幻灯片较多时进程启动开销占主导。
     
     Args:
         source_video: 原始视频路径
@@ -410,37 +444,240 @@ def extract_frames_batch(
         progress_callback: 进度回调
     
     Returns:
-        list[Path]: 成功截取的图片路径列表
+        list[Path]: 成功截取的图片路径列表 (按时间戳升序)
     """
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    results: list[Path] = []
+    timestamps = sorted(timestamps)
     total = len(timestamps)
     
     logger.info(f"📸 开始批量高清回溯: 共 {total} 个时间点")
     
-    for i, ts in enumerate(timestamps):
-        # 生成输出文件名: slide_0001_12.345s.jpg
-        output_path = output_dir / f"slide_{i:04d}_{ts:.2f}s.jpg"
+    if not timestamps:
+        return []
+    
+    # 单次截取需完整解码原视频，优先 NVDEC 硬解，失败则以 CPU 软解重试
+    results = None
+    decode_modes = [True, False] if _check_cuda_hwaccel_available() else [False]
+    for use_gpu_decode in decode_modes:
+        results = _extract_frames_single_pass(
+            source_video=Path(source_video),
+            timestamps=timestamps,
+            output_dir=output_dir,
+            crop_box=crop_box,
+            progress_callback=progress_callback,
+            use_gpu_decode=use_gpu_decode
+        )
+        if results is not None:
+            break
+        if use_gpu_decode:
+            logger.warning("⚠️ NVDEC 硬解截取失败，尝试 CPU 软解...")
+    
+    if results is None:
+        logger.warning("⚠️ 单次截取失败，回退为逐帧截取...")
+        results = _extract_frames_per_timestamp(
+            source_video=source_video,
+            timestamps=timestamps,
+            output_dir=output_dir,
+            crop_box=crop_box,
+            progress_callback=progress_callback
+        )
+    
+    logger.success(f"✅ 批量截取完成: {len(results)}/{total} 成功")
+    return results
+
+
+def _extract_frames_single_pass(
+    source_video: Path,
+    timestamps: list[float],
+    output_dir: Path,
+    crop_box: Optional[Tuple[int, int, int, int]] = None,
+    progress_callback: Optional[Callable[[int, str], None]] = None,
+    use_gpu_decode: bool = False
+) -> Optional[list[Path]]:
+    """
+    单次 FFmpeg 调用截取全部时间点 (select 滤镜)
+    
+    对每个时间点 T，选中"第一个 t >= T 的帧":
+        gte(t,T) * lt(prev_pts*TB,T)
+    所有时间点的表达式相加即为 select 条件，输入只解码一遍。
+    
+    Args:
+        source_video: 原始视频路径
+        timestamps: 目标时间戳列表 (秒，已升序)
+        output_dir: 输出目录
+        crop_box: 可选裁剪区域
+        progress_callback: 进度回调
+        use_gpu_decode: 是否使用 NVDEC 硬解 (-hwaccel cuda)
+    
+    Returns:
+        list[Path]: 截取的图片路径列表 (与 timestamps 一一对应)，
+            失败或输出数量不匹配时返回 None
+    """
+    total = len(timestamps)
+    
+    # Why `-ss` 在 `-i` 前面?
+    #   粗定位到第一个时间点之前，跳过开头无关内容。
+    #   输入定位后滤镜中的 t 从定位点重新计时，故表达式中的时间需减去偏移
+    seek_start = max(0.0, timestamps[0] - 1.0)
+    
+    terms = [
+        f"gte(t,{ts - seek_start:.3f})*lt(prev_pts*TB,{ts - seek_start:.3f})"
+        for ts in timestamps
+    ]
+    # 首帧的 prev_pts 为 NAN，单独处理第一个时间点正好落在首帧的情况
+    terms.append(f"isnan(prev_pts)*gte(t,{timestamps[0] - seek_start:.3f})")
+    
+    # 先 select 再 crop: 只裁剪被选中的帧
+    vf_filter = f"select='{'+'.join(terms)}'"
+    if crop_box:
+        x, y, w, h = _align_even(crop_box)
+        vf_filter += f",crop={w}:{h}:{x}:{y}"
+    
+    output_pattern = output_dir / "_batch_%04d.jpg"
+    
+    cmd = ["ffmpeg", "-y"]
+    
+    # Why 不加 -hwaccel_output_format cuda?
+    #   select 表达式与 crop 在 CPU 上求值，且只有少数选中帧需要编码为 JPEG，
+    #   NVDEC 负责的是占大头的全片解码，解码帧回传内存即可
+    if use_gpu_decode:
+        cmd.extend(["-hwaccel", "cuda"])
+    
+    cmd.extend([
+        "-ss", f"{seek_start:.3f}",
+        "-i", str(source_video),
+        "-vf", vf_filter,
+        "-vsync", "vfr",   # 只输出被选中的帧，不补帧
+        *_image_encode_args(output_pattern),
+        str(output_pattern)
+    ])
+    
+    mode_str = "NVDEC" if use_gpu_decode else "CPU"
+    logger.debug(f"📸 单次截取 {total} 帧 (起始定位 {seek_start:.2f}s, 解码: {mode_str})")
+    
+    try:
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+        
+        stderr_lines = []
+        last_progress_time = 0.0
+        for line in process.stderr:
+            stderr_lines.append(line)
+            
+            if not progress_callback:
+                continue
+            now = time.time()
+            if now - last_progress_time < STDERR_PROGRESS_INTERVAL:
+                continue
+            
+            match = _FRAME_PATTERN.search(line)
+            if match:
+                done = min(total, int(match.group(1)))
+                progress_callback(int(done / total * 100), f"高清回溯: {done}/{total}")
+                last_progress_time = now
         
-        frame_path = extract_frame_at_timestamp(
+        process.wait()
+    except Exception as e:
+        logger.warning(f"⚠️ 单次截取执行异常: {e}")
+        return None
+    
+    generated = sorted(output_dir.glob("_batch_*.jpg"))
+    
+    if process.returncode != 0 or len(generated) != total:
+        stderr_tail = ''.join(stderr_lines)[-200:]
+        logger.warning(f"⚠️ 单次截取结果异常: returncode={process.returncode}, "
+                       f"输出 {len(generated)}/{total} 帧: {stderr_tail}")
+        for p in generated:
+            p.unlink(missing_ok=True)
+        return None
+    
+    # 按输出顺序映射回时间戳，重命名为 slide_0001_12.34s.jpg
+    results: list[Path] = []
+    for i, (ts, tmp_path) in enumerate(zip(timestamps, generated)):
+        output_path = output_dir / f"slide_{i:04d}_{ts:.2f}s.jpg"
+        tmp_path.replace(output_path)
+        results.append(output_path)
+    
+    if progress_callback:
+        progress_callback(100, f"高清回溯: {total}/{total}")
+    
+    return results
+
+
+def _extract_frames_per_timestamp(
+    source_video: Path,
+    timestamps: list[float],
+    output_dir: Path,
+    crop_box: Optional[Tuple[int, int, int, int]] = None,
+    progress_callback: Optional[Callable[[int, str], None]] = None
+) -> list[Path]:
+    """
+    逐个时间点截取高清帧 (回退路径)
+    
+    每个时间点独立调用 extract_frame_at_timestamp，
+    时间点较多时由线程池并发启动多个 FFmpeg 进程。
+    
+    Why 线程池?
+        各 FFmpeg 进程互不依赖，线程只负责等待子进程，
+        解码在子进程中并行进行，不受 GIL 限制。
+    
+    Args:
+        source_video: 原始视频路径
+        timestamps: 目标时间戳列表 (秒)
+        output_dir: 输出目录
+        crop_box: 可选裁剪区域
+        progress_callback: 进度回调
+    
+    Returns:
+        list[Path]: 成功截取的图片路径列表
+    """
+    total = len(timestamps)
+    frame_paths: list[Optional[Path]] = [None] * total
+    
+    def extract(i: int, ts: float) -> Optional[Path]:
+        # 生成输出文件名: slide_0001_12.345s.jpg
+        return extract_frame_at_timestamp(
             source_video=source_video,
             timestamp=ts,
-            output_path=output_path,
+            output_path=output_dir / f"slide_{i:04d}_{ts:.2f}s.jpg",
             crop_box=crop_box
         )
+    
+    def on_done(done: int, i: int, ts: float, frame_path: Optional[Path]) -> None:
+        frame_paths[i] = frame_path
         
         if frame_path:
-            results.append(frame_path)
             logger.debug(f"   ✅ [{i+1}/{total}] @ {ts:.2f}s")
         else:
             logger.warning(f"   ❌ [{i+1}/{total}] @ {ts:.2f}s 失败")
         
-        # 进度回调
+        # 进度回调 (按完成数量，在调用线程中执行)
         if progress_callback:
-            percent = int(((i + 1) / total) * 100)
-            progress_callback(percent, f"高清回溯: {i+1}/{total}")
+            percent = int((done / total) * 100)
+            progress_callback(percent, f"高清回溯: {done}/{total}")
     
-    logger.success(f"✅ 批量截取完成: {len(results)}/{total} 成功")
-    return results
+    if total <= PER_TIMESTAMP_SERIAL_MAX:
+        # 时间点很少时线程池的开销不划算，直接串行
+        for i, ts in enumerate(timestamps):
+            on_done(i + 1, i, ts, extract(i, ts))
+    else:
+        max_workers = min(os.cpu_count() or 1, PER_TIMESTAMP_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="frame-extract") as executor:
+            futures = {
+                executor.submit(extract, i, ts): (i, ts)
+                for i, ts in enumerate(timestamps)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                i, ts = futures[future]
+                on_done(done, i, ts, future.result())
+    
+    # 按时间戳顺序返回成功的帧
+    return [p for p in frame_paths if p]
@@ -0,0 +1,177 @@
+"""
+文件名: pptx_utils.py
+功能描述: PPTX 快速组装模块，将图片序列直接写成全屏图片幻灯片
+核心逻辑:
+    - build_image_pptx(): 基于空白模板，以 zipfile 直接写入幻灯片 XML 与图片
+    - _get_template(): 进程内缓存的空白 16:9 模板 (python-pptx 仅生成一次)
+
+设计亮点:
+    - 热路径不构建 XML DOM，幻灯片 XML 由字符串模板生成
+    - 图片以 ZIP_STORED 写入 (JPEG 已压缩，无需再次 deflate)
+    - presentation.xml / rels / [Content_Types].xml 各只修补一次
+"""
+import functools
+import io
+import zipfile
+from pathlib import Path
+from typing import Tuple
+from xml.sax.saxutils import quoteattr
+
+from loguru import logger
+
+
+# ============================================================
+#              OOXML 常量与模板
+# ============================================================
+_REL_TYPE_SLIDE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+_REL_TYPE_LAYOUT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout"
+_REL_TYPE_IMAGE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+_CT_SLIDE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+_IMAGE_CONTENT_TYPES = {"jpg": "image/jpeg", "jpeg": "image/jpeg", "png": "image/png"}
+
+# 幻灯片 ID 起始值 (OOXML 规定 sldId 从 256 开始)
+_FIRST_SLIDE_ID = 256
+
+_SLIDE_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+    '<p:cSld><p:spTree>'
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr><p:grpSpPr/>'
+    '<p:pic><p:nvPicPr><p:cNvPr id="2" name="Picture 1" descr={descr}/>'
+    '<p:cNvPicPr><a:picLocks noChangeAspect="1"/></p:cNvPicPr><p:nvPr/></p:nvPicPr>'
+    '<p:blipFill><a:blip r:embed="rId2"/><a:stretch><a:fillRect/></a:stretch></p:blipFill>'
+    '<p:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr></p:pic>'
+    '</p:spTree></p:cSld>'
+    '<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>'
+)
+
+_SLIDE_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="' + _REL_TYPE_LAYOUT + '" Target="../slideLayouts/{layout}"/>'
+    '<Relationship Id="rId2" Type="' + _REL_TYPE_IMAGE + '" Target="../media/{media}"/>'
+    '</Relationships>'
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_template(width_emu: int, height_emu: int) -> Tuple[bytes, str]:
+    """
+    生成并缓存指定尺寸的空白 PPTX 模板
+
+    Why 运行时生成而非随仓库提交 .pptx?
+        python-pptx 自带默认模板，生成一次仅需几十毫秒，
+        避免在仓库中维护二进制资源文件。
+
+    Args:
+        width_emu: 幻灯片宽度 (EMU)
+        height_emu: 幻灯片高度 (EMU)
+
+    Returns:
+        Tuple[bytes, str]: (模板 zip 字节, 空白版式文件名如 "slideLayout7.xml")
+    """
+    from pptx import Presentation
+
+    prs = Presentation()
+    prs.slide_width = width_emu
+    prs.slide_height = height_emu
+
+    # 版式 6 为默认模板中的 "Blank" 空白版式
+    blank_layout = Path(str(prs.slide_layouts[6].part.partname)).name
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue(), blank_layout
+
+
+# ============================================================
+#              PPTX 组装
+# ============================================================
+
+def build_image_pptx(
+    image_paths: list[Path],
+    output_path: Path,
+    width_emu: int,
+    height_emu: int
+) -> Path:
+    """
+    将图片序列组装为 PPTX，每张图片铺满一页
+
+    等价于对每张图片调用 python-pptx 的 add_slide + add_picture，
+    但直接写 zip 条目，不经过 XML DOM 序列化。
+
+    Args:
+        image_paths: 图片路径列表 (按页序)
+        output_path: 输出 PPTX 路径
+        width_emu: 幻灯片宽度 (EMU)
+        height_emu: 幻灯片高度 (EMU)
+
+    Returns:
+        Path: 生成的 PPTX 文件路径
+    """
+    output_path = Path(output_path)
+    template_bytes, blank_layout = _get_template(width_emu, height_emu)
+
+    image_paths = [Path(p) for p in image_paths]
+    media_names = [
+        f"image{i}.{p.suffix.lower().lstrip('.') or 'jpeg'}"
+        for i, p in enumerate(image_paths, start=1)
+    ]
+    extensions = {name.rsplit(".", 1)[1] for name in media_names}
+
+    sld_ids = "".join(
+        f'<p:sldId id="{_FIRST_SLIDE_ID + i - 1}" r:id="rIdSlide{i}"/>'
+        for i in range(1, len(image_paths) + 1)
+    )
+    pres_rels = "".join(
+        f'<Relationship Id="rIdSlide{i}" Type="{_REL_TYPE_SLIDE}" Target="slides/slide{i}.xml"/>'
+        for i in range(1, len(image_paths) + 1)
+    )
+    overrides = "".join(
+        f'<Override PartName="/ppt/slides/slide{i}.xml" ContentType="{_CT_SLIDE}"/>'
+        for i in range(1, len(image_paths) + 1)
+    )
+
+    with zipfile.ZipFile(io.BytesIO(template_bytes)) as template, \
+         zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as out:
+
+        # ----- 复制模板并修补三个索引文件 ([Content_Types].xml 保持为首个条目) -----
+        for item in template.infolist():
+            data = template.read(item.filename)
+
+            if item.filename == "ppt/presentation.xml" and sld_ids:
+                data = data.replace(
+                    b"</p:sldMasterIdLst>",
+                    b"</p:sldMasterIdLst><p:sldIdLst>" + sld_ids.encode() + b"</p:sldIdLst>",
+                    1
+                )
+            elif item.filename == "ppt/_rels/presentation.xml.rels":
+                data = data.replace(b"</Relationships>", pres_rels.encode() + b"</Relationships>", 1)
+            elif item.filename == "[Content_Types].xml":
+                defaults = "".join(
+                    f'<Default Extension="{ext}" ContentType="{_IMAGE_CONTENT_TYPES.get(ext, "image/jpeg")}"/>'
+                    for ext in sorted(extensions)
+                    if f'Extension="{ext}"'.encode() not in data
+                )
+                data = data.replace(b"</Types>", (defaults + overrides).encode() + b"</Types>", 1)
+
+            out.writestr(item, data)
+
+        # ----- 写入每页幻灯片与图片 -----
+        for i, (img_path, media_name) in enumerate(zip(image_paths, media_names), start=1):
+            out.write(img_path, f"ppt/media/{media_name}", compress_type=zipfile.ZIP_STORED)
+            out.writestr(
+                f"ppt/slides/slide{i}.xml",
+                _SLIDE_XML.format(descr=quoteattr(img_path.name), cx=width_emu, cy=height_emu)
+            )
+            out.writestr(
+                f"ppt/slides/_rels/slide{i}.xml.rels",
+                _SLIDE_RELS_XML.format(layout=blank_layout, media=media_name)
+            )
+
+            logger.debug(f"   📄 添加第 {i} 页: {img_path.name}")
+
+    return output_path